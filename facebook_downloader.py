@@ -21,41 +21,142 @@ import sys
 import json
 import shutil
 import zipfile
+import hashlib
+import functools
 import platform
 import subprocess
-import urllib.request
-from pathlib import Path
 from datetime import datetime
 import tempfile
 import time
+import queue
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import requests
 
 # Default download directory
 DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "Facebook_Videos")
 
+# Directory containing this script
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # yt-dlp executable path
-YTDLP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yt-dlp.exe")
+YTDLP_PATH = os.path.join(SCRIPT_DIR, "yt-dlp.exe")
+
+# Checksums published alongside the latest yt-dlp release
+YTDLP_SUMS_URL = "https://github.com/yt-dlp/yt-dlp/releases/latest/download/SHA2-256SUMS"
 
 # ffmpeg path
-FFMPEG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin")
+FFMPEG_DIR = os.path.join(SCRIPT_DIR, "bin")
 FFMPEG_PATH = os.path.join(FFMPEG_DIR, "ffmpeg.exe")
 
+# Location of ffmpeg.exe inside the BtbN build archive
+FFMPEG_ZIP_ENTRY_PATTERN = re.compile(r'ffmpeg-master-[^/]*/bin/ffmpeg\.exe$')
+
+# Buffer size used when streaming downloads and archive members to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Number of yt-dlp output lines kept for reporting errors
+OUTPUT_TAIL_LINES = 50
+
+# Shared HTTP session, so repeated tool downloads reuse the GitHub connection
+HTTP_SESSION = requests.Session()
+
+# Number of videos downloaded at the same time in batch mode
+MAX_WORKERS = 4
+
+# yt-dlp format strings that fetch the video and audio streams as separate
+# files, so batch mode can merge them with ffmpeg while other downloads run.
+# Posts that only offer progressive formats fall back to a single file.
+STREAM_FORMAT_MAP = {
+    "best": "(bestvideo,bestaudio)/best",
+    "medium": "(bestvideo[height<=720],bestaudio)/best[height<=720]",
+    "worst": "(worstvideo,worstaudio)/worst"
+}
+
+# Facebook URL pattern, compiled once at import. All accepted URL shapes share
+# one alternation so the scheme/host prefix is only matched once per URL.
+FACEBOOK_URL_PATTERN = re.compile(
+    r'https?://(?:www\.|m\.|web\.)?'
+    r'(?:facebook\.com/(?:[^/]+/videos/(?:[^/]+/)?[0-9]+'
+    r'|watch\?v=[0-9]+'
+    r'|[^/]+/posts/[0-9]+'
+    r'|watch/live/\?v=[0-9]+'
+    r'|reel/[0-9]+'
+    r'|story\.php\?story_fbid=[0-9]+&id=[0-9]+)'
+    r'|fb\.watch/[a-zA-Z0-9_-]+)'
+)
+
+def download_file(url, path):
+    """
+    Stream a file from url to path using the shared HTTP session.
+    
+    Returns:
+        str: SHA-256 hex digest of the downloaded data
+    """
+    sha256 = hashlib.sha256()
+    with HTTP_SESSION.get(url, stream=True) as response:
+        response.raise_for_status()
+        with open(path, 'wb') as f:
+            for chunk in response.iter_content(COPY_BUFFER_SIZE):
+                sha256.update(chunk)
+                f.write(chunk)
+    return sha256.hexdigest()
+
+def get_published_checksum(sums_url, filename):
+    """
+    Get the SHA-256 checksum listed for filename in a SHA2-256SUMS file.
+    
+    Returns:
+        str: The checksum, or None if the file is not listed or the SHA2-256SUMS
+             file cannot be fetched
+    """
+    try:
+        response = HTTP_SESSION.get(sums_url)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Could not fetch {sums_url}: {e}")
+        return None
+    for line in response.text.splitlines():
+        checksum, _, name = line.strip().partition(" ")
+        if name.strip().lstrip("*") == filename:
+            return checksum.lower()
+    return None
+
+@functools.lru_cache(maxsize=1)
 def download_ytdlp():
-    """Download the latest yt-dlp executable if not present."""
+    """Download the latest yt-dlp executable if not present (cached after the first call)."""
     if os.path.exists(YTDLP_PATH):
         return YTDLP_PATH
     
     print("yt-dlp not found. Downloading...")
+    # Download to a partial file and only move it into place once verified, so
+    # a failed or interrupted download never leaves a yt-dlp.exe behind
+    partial_path = YTDLP_PATH + ".part"
     try:
         url = "https://github.com/yt-dlp/yt-dlp/releases/latest/download/yt-dlp.exe"
-        urllib.request.urlretrieve(url, YTDLP_PATH)
+        checksum = download_file(url, partial_path)
+        
+        # Verify the download against the checksum published with the release.
+        # The digest was computed while streaming, so the file is not re-read.
+        expected = get_published_checksum(YTDLP_SUMS_URL, "yt-dlp.exe")
+        if expected is None:
+            print("Warning: Could not verify yt-dlp.exe against a published checksum.")
+        elif checksum != expected:
+            raise ValueError("checksum mismatch, the download may be corrupt")
+        
+        os.replace(partial_path, YTDLP_PATH)
         print("yt-dlp downloaded successfully.")
         return YTDLP_PATH
     except Exception as e:
         print(f"Error downloading yt-dlp: {e}")
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
         sys.exit(1)
 
+@functools.lru_cache(maxsize=1)
 def get_ffmpeg_path():
-    """Get the path to ffmpeg, downloading it if necessary."""
+    """Get the path to ffmpeg, downloading it if necessary (cached after the first call)."""
     # Check if ffmpeg is already in the bin directory
     if os.path.exists(FFMPEG_PATH):
         return FFMPEG_PATH
@@ -75,18 +176,15 @@ def get_ffmpeg_path():
             # Download the latest ffmpeg build for Windows
             ffmpeg_zip = os.path.join(temp_dir, "ffmpeg.zip")
             ffmpeg_url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
-            urllib.request.urlretrieve(ffmpeg_url, ffmpeg_zip)
+            download_file(ffmpeg_url, ffmpeg_zip)
             
-            # Extract the zip file
+            # Extract only ffmpeg.exe instead of the whole archive
             with zipfile.ZipFile(ffmpeg_zip, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Find the ffmpeg.exe in the extracted directory
-            ffmpeg_dir = next(Path(temp_dir).glob("ffmpeg-master-*"))
-            ffmpeg_bin_dir = ffmpeg_dir / "bin"
-            
-            # Copy ffmpeg.exe to our bin directory
-            shutil.copy(ffmpeg_bin_dir / "ffmpeg.exe", FFMPEG_PATH)
+                ffmpeg_entry = next((name for name in zip_ref.namelist() if FFMPEG_ZIP_ENTRY_PATTERN.match(name)), None)
+                if ffmpeg_entry is None:
+                    raise FileNotFoundError("ffmpeg.exe not found in the downloaded archive")
+                with zip_ref.open(ffmpeg_entry) as src, open(FFMPEG_PATH, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
             
             print(f"ffmpeg downloaded and installed to {FFMPEG_PATH}")
             return FFMPEG_PATH
@@ -97,21 +195,38 @@ def get_ffmpeg_path():
 
 def is_valid_facebook_url(url):
     """Check if the URL is a valid Facebook URL."""
-    facebook_patterns = [
-        r'https?://(www\.|m\.|web\.)?facebook\.com/[^/]+/videos/[0-9]+',
-        r'https?://(www\.|m\.|web\.)?facebook\.com/watch\?v=[0-9]+',
-        r'https?://(www\.|m\.|web\.)?facebook\.com/[^/]+/posts/[0-9]+',
-        r'https?://(www\.|m\.|web\.)?facebook\.com/[^/]+/videos/[^/]+/[0-9]+',
-        r'https?://(www\.|m\.|web\.)?facebook\.com/watch/live/\?v=[0-9]+',
-        r'https?://(www\.|m\.|web\.)?fb\.watch/[a-zA-Z0-9_-]+/?',
-        r'https?://(www\.|m\.|web\.)?facebook\.com/reel/[0-9]+',
-        r'https?://(www\.|m\.|web\.)?facebook\.com/story\.php\?story_fbid=[0-9]+&id=[0-9]+'
-    ]
+    # Cheap rejection of obviously invalid input before running the regex
+    if not url.startswith(("http://", "https://")):
+        return False
+    if "facebook.com" not in url and "fb.watch" not in url:
+        return False
+
+    return FACEBOOK_URL_PATTERN.match(url) is not None
+
+def run_ytdlp(cmd):
+    """
+    Run a yt-dlp command, printing its output as it arrives.
+    
+    stderr is merged into stdout, so a chatty run cannot fill one pipe while
+    the other is being read, and only the last lines are kept for errors.
     
-    for pattern in facebook_patterns:
-        if re.match(pattern, url):
-            return True
-    return False
+    Args:
+        cmd (list): The yt-dlp command line
+    
+    Returns:
+        tuple: (return code, error lines from the end of the output)
+    """
+    # --newline prints each progress update on its own line instead of using \r
+    cmd = [cmd[0], "--newline", *cmd[1:]]
+    output_tail = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1) as process:
+        for line in process.stdout:
+            print(line, end="")
+            if line.strip():
+                output_tail.append(line.strip())
+        returncode = process.wait()
+    errors = [line for line in output_tail if line.startswith("ERROR")]
+    return returncode, "\n".join(errors or output_tail)
 
 def download_facebook_video(url, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR):
     """
@@ -160,69 +275,68 @@ def download_facebook_video(url, quality="best", download_dir=DEFAULT_DOWNLOAD_D
         "--merge-output-format", "mp4",
         "-o", output_template,
         "--no-write-info-json",  # Skip writing JSON metadata to avoid filename issues
+        "--no-mtime",  # Keep the download time as mtime, so the new file can be found below
         "--no-playlist",
         "--geo-bypass",  # Bypass geo-restrictions
+        "--concurrent-fragments", "8",  # Fetch DASH/HLS fragments in parallel
+        "--http-chunk-size", "10M",
         url
     ]
     
+    # Mobile version of the URL, used by the later fallback attempts
+    mobile_url = url.replace("www.facebook.com", "m.facebook.com")
+    if mobile_url == url:  # If no change was made
+        mobile_url = url.replace("facebook.com", "m.facebook.com")
+    
+    # Fallback attempts, tried in order until one succeeds:
+    # browser cookies for private content, then the mobile URL, then a
+    # very basic single-format download
+    cookie_cmd = cmd[:-1] + ["--cookies-from-browser", "chrome", url]
+    mobile_cmd = cmd[:-1] + [mobile_url]
+    basic_cmd = [
+        ytdlp_path,
+        "--no-warnings",
+        "--ffmpeg-location", ffmpeg_dir,
+        "-f", "best",  # Just use best format available
+        "-o", os.path.join(download_dir, "facebook_video_%(id)s.mp4"),
+        "--no-write-info-json",
+        "--no-mtime",
+        "--no-check-certificate",  # Skip certificate validation
+        "--no-playlist",
+        "--geo-bypass",
+        mobile_url
+    ]
+    
+    attempts = [
+        (None, cmd),
+        ("Trying with browser cookies...", cookie_cmd),
+        ("Trying with mobile URL format...", mobile_cmd),
+        ("Trying with basic settings...", basic_cmd)
+    ]
+    
     print(f"\nDownloading Facebook video from: {url}")
     print(f"Quality: {quality}")
     print(f"Download directory: {download_dir}")
     print("Please wait...")
     
+    # Files modified from here on belong to this download (whole seconds, as
+    # some filesystems store coarser timestamps than time.time returns)
+    download_started = int(time.time())
+    
     try:
-        # Run the command and capture output
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"Error downloading video: {result.stderr}")
-            
-            # Try with cookies as a fallback for private content
-            print("Trying with browser cookies...")
-            cookie_cmd = cmd.copy()
-            # Insert cookies option before the URL (which is the last item)
-            cookie_cmd.insert(-1, "--cookies-from-browser")
-            cookie_cmd.insert(-1, "chrome")
+        for message, attempt_cmd in attempts:
+            if message:
+                print(message)
             
-            result = subprocess.run(cookie_cmd, capture_output=True, text=True)
+            # Run the command, streaming its progress to the console
+            returncode, error_output = run_ytdlp(attempt_cmd)
+            if returncode == 0:
+                break
             
-            if result.returncode != 0:
-                print(f"Error downloading video: {result.stderr}")
-                
-                # Try with mobile URL as a last resort
-                print("Trying with mobile URL format...")
-                mobile_url = url.replace("www.facebook.com", "m.facebook.com")
-                if mobile_url == url:  # If no change was made
-                    mobile_url = url.replace("facebook.com", "m.facebook.com")
-                
-                cmd[-1] = mobile_url  # Replace the URL with mobile version
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.returncode != 0:
-                    print(f"Error downloading video: {result.stderr}")
-                    
-                    # One final attempt with a very basic approach
-                    print("Trying with basic settings...")
-                    basic_cmd = [
-                        ytdlp_path,
-                        "--no-warnings",
-                        "--ffmpeg-location", ffmpeg_dir,
-                        "-f", "best",  # Just use best format available
-                        "-o", os.path.join(download_dir, "facebook_video_%(id)s.mp4"),
-                        "--no-write-info-json",
-                        "--no-check-certificate",  # Skip certificate validation
-                        "--no-playlist",
-                        "--geo-bypass",
-                        mobile_url
-                    ]
-                    result = subprocess.run(basic_cmd, capture_output=True, text=True)
-                    
-                    if result.returncode != 0:
-                        print(f"Error downloading video: {result.stderr}")
-                        return False
+            print(f"Error downloading video: {error_output}")
+        else:
+            return False
         
-        # Extract metadata from the output
-        output = result.stdout
         print("\nDownload completed successfully!")
         
         # Since we're not writing JSON metadata anymore, display basic info
@@ -231,11 +345,13 @@ def download_facebook_video(url, quality="best", download_dir=DEFAULT_DOWNLOAD_D
         
         # Find the most recently created mp4 file in the directory
         try:
-            mp4_files = [f for f in os.listdir(download_dir) if f.endswith('.mp4') and 
-                        os.path.getmtime(os.path.join(download_dir, f)) > time.time() - 30]
-            
+            # scandir caches each entry's stat, so every file is stat'ed once
+            with os.scandir(download_dir) as entries:
+                mp4_files = [(entry.name, entry.stat().st_mtime) for entry in entries
+                             if entry.name.endswith('.mp4') and entry.stat().st_mtime >= download_started]
+
             if mp4_files:
-                most_recent = max(mp4_files, key=lambda f: os.path.getmtime(os.path.join(download_dir, f)))
+                most_recent = max(mp4_files, key=lambda item: item[1])[0]
                 print(f"Filename: {most_recent}")
         except Exception as e:
             print(f"Could not determine filename: {e}")
@@ -246,6 +362,178 @@ def download_facebook_video(url, quality="best", download_dir=DEFAULT_DOWNLOAD_D
         print(f"An unexpected error occurred: {e}")
         return False
 
+def merge_facebook_streams(merge_queue, results):
+    """
+    Merge downloaded video and audio streams with ffmpeg until the queue is closed.
+    
+    A single stream that already holds both video and audio is only renamed.
+    When a merge fails, the stream files and any partial output are removed,
+    so the URL can be retried from scratch.
+    
+    Args:
+        merge_queue (queue.Queue): (url, stream_paths) items, None to stop
+        results (dict): Per-URL success flags, updated in place
+    """
+    ffmpeg_path = get_ffmpeg_path()
+    
+    while True:
+        item = merge_queue.get()
+        if item is None:
+            break
+        
+        url, stream_paths = item
+        # Strip the ".f<format_id>.<ext>" suffix of the stream filenames
+        base_path = os.path.splitext(os.path.splitext(stream_paths[0])[0])[0]
+        
+        try:
+            if len(stream_paths) == 1:
+                output_file = base_path + os.path.splitext(stream_paths[0])[1]
+                os.replace(stream_paths[0], output_file)
+            else:
+                output_file = base_path + ".mp4"
+                video_path, audio_path = stream_paths
+                cmd = [
+                    ffmpeg_path,
+                    "-y",  # Overwrite output file if it exists
+                    "-i", video_path,
+                    "-i", audio_path,
+                    "-c", "copy",
+                    output_file
+                ]
+                
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                if result.returncode != 0:
+                    raise RuntimeError(result.stderr)
+                
+                for path in stream_paths:
+                    os.remove(path)
+            
+            print(f"\nVideo saved to: {output_file}")
+            results[url] = True
+        except Exception as e:
+            print(f"Error merging {stream_paths[0]}: {e}")
+            for path in stream_paths + [base_path + ".mp4"]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+def download_facebook_videos(urls, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, max_workers=MAX_WORKERS):
+    """
+    Download several Facebook videos concurrently.
+    
+    Args:
+        urls (list): The Facebook URLs
+        quality (str): Video quality (best, medium, worst)
+        download_dir (str): Directory to save the videos
+        max_workers (int): Maximum number of simultaneous downloads
+    
+    Returns:
+        list: One bool per URL, True if that download was successful
+    """
+    # Resolve the tools up front so worker threads never race to download them
+    download_ytdlp()
+    get_ffmpeg_path()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda url: download_facebook_video(url, quality, download_dir), urls))
+
+def download_facebook_batch(urls, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR):
+    """
+    Download several Facebook videos with a single yt-dlp process.
+    
+    All URLs are fed to one yt-dlp process through stdin ("-a -"), which
+    saves the video and audio streams of each URL as separate files. As soon
+    as both streams of a URL (or its one progressive file) are on disk they
+    are handed to a merge thread, so ffmpeg merges one video while yt-dlp is
+    still downloading the next.
+    URLs that yt-dlp could not fetch this way go through the regular
+    download_facebook_video fallback chain, several at a time.
+    
+    Args:
+        urls (list): The Facebook URLs
+        quality (str): Video quality (best, medium, worst)
+        download_dir (str): Directory to save the videos
+    
+    Returns:
+        list: One bool per URL, True if that download was successful
+    """
+    results = {url: False for url in urls}
+    valid_urls = []
+    for url in results:
+        if is_valid_facebook_url(url):
+            valid_urls.append(url)
+        else:
+            print(f"Invalid Facebook URL: {url}")
+    
+    if not valid_urls:
+        return [False] * len(urls)
+    
+    os.makedirs(download_dir, exist_ok=True)
+    ytdlp_path = download_ytdlp()
+    ffmpeg_dir = os.path.dirname(get_ffmpeg_path())
+    
+    format_string = STREAM_FORMAT_MAP.get(quality, STREAM_FORMAT_MAP["best"])
+    output_template = os.path.join(download_dir, "facebook_video_%(upload_date)s_%(id)s.f%(format_id)s.%(ext)s")
+    
+    cmd = [
+        ytdlp_path,
+        "--no-warnings",
+        "--ffmpeg-location", ffmpeg_dir,
+        "-f", format_string,
+        "-o", output_template,
+        # Report where each stream was saved, and whether it has video and audio
+        "--print", "after_move:%(original_url)s %(vcodec)s %(acodec)s %(filepath)s",
+        "--no-write-info-json",
+        "--no-playlist",
+        "--geo-bypass",
+        "--concurrent-fragments", "8",
+        "--http-chunk-size", "10M",
+        "-a", "-"  # Read the URLs from stdin
+    ]
+    
+    print(f"\nDownloading {len(valid_urls)} Facebook videos...")
+    print(f"Quality: {quality}")
+    print(f"Download directory: {download_dir}")
+    print("Please wait...")
+    
+    merge_queue = queue.Queue()
+    merger = threading.Thread(target=merge_facebook_streams, args=(merge_queue, results))
+    merger.start()
+    
+    stream_paths = {url: [] for url in valid_urls}
+    try:
+        with subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1) as process:
+            process.stdin.write("\n".join(valid_urls) + "\n")
+            process.stdin.close()
+            
+            for line in process.stdout:
+                fields = line.rstrip("\n").split(" ", 3)
+                if len(fields) != 4 or fields[0] not in stream_paths:
+                    continue
+                
+                url, vcodec, acodec, path = fields
+                stream_paths[url].append(path)
+                # A progressive format holds both video and audio and needs no merge
+                if len(stream_paths[url]) == 2 or (vcodec != "none" and acodec != "none"):
+                    merge_queue.put((url, stream_paths.pop(url)))
+    finally:
+        # Let the merge thread drain the remaining streams, then stop it
+        merge_queue.put(None)
+        merger.join()
+    
+    # Anything left did not get both streams; retry with the full fallback chain
+    for paths in stream_paths.values():
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+    
+    failed_urls = list(stream_paths) + [url for url in valid_urls if url not in stream_paths and not results[url]]
+    if failed_urls:
+        print(f"\nRetrying {len(failed_urls)} videos individually...")
+        for url, success in zip(failed_urls, download_facebook_videos(failed_urls, quality, download_dir)):
+            results[url] = success
+    
+    return [results[url] for url in urls]
+
 def main():
     """Main function to run the Facebook video downloader."""
     print("=" * 70)
@@ -258,7 +546,7 @@ def main():
     print(f"Using ffmpeg from: {os.path.dirname(ffmpeg_path)}")
     
     while True:
-        print("\nEnter Facebook URL (or 'q' to quit): ", end="")
+        print("\nEnter Facebook URL ('b' for batch mode, 'q' to quit): ", end="")
         url = input().strip()
         
         if url.lower() == 'q':
@@ -268,6 +556,20 @@ def main():
             print("Please enter a valid URL.")
             continue
         
+        # Batch mode: collect several URLs and download them concurrently
+        if url.lower() == 'b':
+            print("Enter Facebook URLs, one per line (empty line to finish):")
+            urls = []
+            while True:
+                line = input().strip()
+                if not line:
+                    break
+                urls.append(line)
+            
+            if not urls:
+                print("No URLs entered.")
+                continue
+        
         # Quality selection
         print("\nSelect video quality:")
         print("1. Best quality (default)")
@@ -301,6 +603,11 @@ def main():
         else:
             download_dir = DEFAULT_DOWNLOAD_DIR
         
+        if url.lower() == 'b':
+            results = download_facebook_batch(urls, quality, download_dir)
+            print(f"\n{sum(results)} of {len(urls)} videos saved to: {download_dir}")
+            continue
+        
         # Download the video
         success = download_facebook_video(url, quality, download_dir)
         
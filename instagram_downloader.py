@@ -21,13 +21,27 @@ import sys
 import json
 import shutil
 import zipfile
+import hashlib
+import functools
 import platform
 import subprocess
 import urllib.request
-from pathlib import Path
 from datetime import datetime
 import tempfile
-import time
+import locale
+import collections
+import argparse
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Use yt-dlp in-process when the package is installed, to skip starting an
+# executable for every download
+try:
+    from yt_dlp import YoutubeDL
+    from yt_dlp.utils import DownloadError
+except ImportError:
+    YoutubeDL = None
 
 # Default download directory
 DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "Instagram_Videos")
@@ -39,86 +53,416 @@ YTDLP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yt-dlp.ex
 FFMPEG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin")
 FFMPEG_PATH = os.path.join(FFMPEG_DIR, "ffmpeg.exe")
 
+# Sidecar file remembering where the tools were found, so later runs can skip the lookup
+TOOLS_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools.json")
+
+# ffmpeg build downloaded when ffmpeg is not installed
+FFMPEG_RELEASE_URL = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest"
+FFMPEG_ARCHIVE_NAME = "ffmpeg-master-latest-win64-gpl.zip"
+
+# YoutubeDL instances kept alive for the session, keyed by (quality, download directory)
+YOUTUBE_DL_INSTANCES = {}
+
+# Output filename template
+OUTPUT_TEMPLATE = "%(uploader)s_%(upload_date)s_%(title).50s.%(ext)s"
+
+# Map quality options to yt-dlp format strings
+QUALITY_FORMAT_MAP = {
+    "best": "bestvideo+bestaudio/best",
+    "medium": "bestvideo[height<=720]+bestaudio/best[height<=720]",
+    "worst": "worstvideo+worstaudio/worst"
+}
+
+# Map menu choices to quality options
+QUALITY_CHOICE_MAP = {
+    "1": "best",
+    "2": "medium",
+    "3": "worst",
+    "": "best"  # Default
+}
+
+# Buffer size used when streaming downloads and archive members to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Largest ffmpeg archive kept in memory before it is spooled to a temporary file
+ARCHIVE_SPOOL_SIZE = 256 * 1024 * 1024
+
+# Number of yt-dlp output lines kept for error reporting
+OUTPUT_TAIL_LINES = 50
+
+# Marker and template for the line yt-dlp prints with the post metadata. The
+# fields are printed as one JSON object, so captions containing tabs or
+# newlines cannot break the line apart.
+METADATA_PRINT_PREFIX = b"post-metadata:"
+METADATA_PRINT_TEMPLATE = ("before_dl:post-metadata:"
+                           "%(.{uploader,upload_date,like_count,comment_count,description})j")
+
+# Encoding yt-dlp uses when its output is piped
+OUTPUT_ENCODING = locale.getpreferredencoding(False)
+
+# Default number of yt-dlp processes run at the same time in batch mode
+DEFAULT_CONCURRENCY = 4
+
+# Settings that stay the same for every download in a run: the tool paths and
+# the yt-dlp arguments that do not depend on the URL. ytdlp_path is None until
+# the executable is needed, as in-process downloads do not use it.
+RunContext = collections.namedtuple("RunContext", ["ytdlp_path", "ffmpeg_dir", "base_args"])
+
+# Instagram URL pattern, compiled once at import. Posts, reels, TV and stories
+# share one alternation so the host is only matched once per URL.
+INSTAGRAM_URL_PATTERN = re.compile(
+    r'https?://(?:www\.)?'
+    r'(?:instagram\.com/(?:(?:p|reel|tv)/[a-zA-Z0-9_-]+'
+    r'|stories/[a-zA-Z0-9_.]+/[0-9]+)'
+    r'|instagr\.am/(?:p|reel)/[a-zA-Z0-9_-]+)'
+)
+
+def copy_url(url, dst):
+    """
+    Stream the body of url into the writable binary file object dst in large chunks.
+    
+    Returns:
+        str: SHA-256 hex digest of the data, computed while it is copied
+    """
+    sha256 = hashlib.sha256()
+    request = urllib.request.Request(url, headers={"Accept-Encoding": "identity"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        for chunk in iter(lambda: response.read(COPY_BUFFER_SIZE), b""):
+            sha256.update(chunk)
+            dst.write(chunk)
+    return sha256.hexdigest()
+
+def download_file(url, path):
+    """
+    Stream a file from url to path in large chunks.
+    
+    Returns:
+        str: SHA-256 hex digest of the downloaded data
+    """
+    with open(path, 'wb', buffering=COPY_BUFFER_SIZE) as f:
+        return copy_url(url, f)
+
+def get_published_checksum(sums_url, filename):
+    """
+    Get the SHA-256 checksum listed for filename in a checksums file.
+    
+    Returns:
+        str: The checksum, or None if the file is not listed or the checksums
+             file cannot be fetched
+    """
+    try:
+        with urllib.request.urlopen(sums_url, timeout=30) as response:
+            sums = response.read().decode("utf-8", errors="replace")
+    except OSError as e:  # urllib.error.URLError is an OSError
+        print(f"Could not fetch {sums_url}: {e}")
+        return None
+    for line in sums.splitlines():
+        checksum, _, name = line.strip().partition(" ")
+        if name.strip().lstrip("*") == filename:
+            return checksum.lower()
+    return None
+
+def load_tools_cache():
+    """Load the tool paths remembered by earlier runs from the sidecar file."""
+    try:
+        with open(TOOLS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+TOOLS_CACHE = load_tools_cache()
+TOOLS_CACHE_LOCK = threading.Lock()
+
+def get_cached_tool(name):
+    """Get the remembered path of a tool if the file has not changed since, or None."""
+    entry = TOOLS_CACHE.get(name)
+    try:
+        if os.path.getmtime(entry["path"]) == entry["mtime"]:
+            return entry["path"]
+    except (OSError, KeyError, TypeError):
+        pass
+    return None
+
+def remember_tool(name, path):
+    """Record the path and mtime of a tool in the sidecar file, and return the path."""
+    with TOOLS_CACHE_LOCK:
+        try:
+            TOOLS_CACHE[name] = {"path": path, "mtime": os.path.getmtime(path)}
+            with open(TOOLS_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(TOOLS_CACHE, f)
+        except OSError:
+            pass  # Not being able to remember the path only costs a lookup next time
+    return path
+
+@functools.lru_cache(maxsize=1)
 def download_ytdlp():
-    """Download the latest yt-dlp executable if not present."""
+    """Download the latest yt-dlp executable if not present (cached after the first call)."""
+    cached_path = get_cached_tool("ytdlp")
+    if cached_path:
+        return cached_path
+    
     if os.path.exists(YTDLP_PATH):
-        return YTDLP_PATH
+        return remember_tool("ytdlp", YTDLP_PATH)
     
     print("yt-dlp not found. Downloading...")
+    # Download to a partial file and only move it into place once complete, so
+    # an interrupted download is never remembered as a working yt-dlp.exe
+    partial_path = YTDLP_PATH + ".part"
     try:
         url = "https://github.com/yt-dlp/yt-dlp/releases/latest/download/yt-dlp.exe"
-        urllib.request.urlretrieve(url, YTDLP_PATH)
+        download_file(url, partial_path)
+        os.replace(partial_path, YTDLP_PATH)
         print("yt-dlp downloaded successfully.")
-        return YTDLP_PATH
+        return remember_tool("ytdlp", YTDLP_PATH)
     except Exception as e:
         print(f"Error downloading yt-dlp: {e}")
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
         sys.exit(1)
 
+@functools.lru_cache(maxsize=1)
 def get_ffmpeg_path():
-    """Get the path to ffmpeg, downloading it if necessary."""
+    """Get the path to ffmpeg, downloading it if necessary (cached after the first call)."""
+    # Use the path found by an earlier run, skipping the PATH search
+    cached_path = get_cached_tool("ffmpeg")
+    if cached_path:
+        return cached_path
+    
     # Check if ffmpeg is already in the bin directory
     if os.path.exists(FFMPEG_PATH):
-        return FFMPEG_PATH
+        return remember_tool("ffmpeg", FFMPEG_PATH)
     
     # Check if ffmpeg is in PATH
     ffmpeg_in_path = shutil.which("ffmpeg")
     if ffmpeg_in_path:
-        return ffmpeg_in_path
+        return remember_tool("ffmpeg", ffmpeg_in_path)
     
     print("ffmpeg not found. Downloading...")
     try:
         # Create bin directory if it doesn't exist
         os.makedirs(FFMPEG_DIR, exist_ok=True)
         
-        # Download ffmpeg from GitHub
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Download the latest ffmpeg build for Windows
-            ffmpeg_zip = os.path.join(temp_dir, "ffmpeg.zip")
-            ffmpeg_url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
-            urllib.request.urlretrieve(ffmpeg_url, ffmpeg_zip)
+        # Download the latest ffmpeg build for Windows straight into memory
+        # (spilling to a temporary file only past ARCHIVE_SPOOL_SIZE), so the
+        # archive is never written to and re-read from disk
+        ffmpeg_url = f"{FFMPEG_RELEASE_URL}/{FFMPEG_ARCHIVE_NAME}"
+        with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_SIZE) as archive:
+            checksum = copy_url(ffmpeg_url, archive)
             
-            # Extract the zip file
-            with zipfile.ZipFile(ffmpeg_zip, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
+            # Verify the archive against the checksums published with the
+            # build before extracting anything. The digest was computed while
+            # streaming, so the archive is not read an extra time.
+            expected = get_published_checksum(f"{FFMPEG_RELEASE_URL}/checksums.sha256", FFMPEG_ARCHIVE_NAME)
+            if expected is None:
+                print(f"Warning: Could not verify {FFMPEG_ARCHIVE_NAME} against a published checksum.")
+            elif checksum != expected:
+                raise ValueError("checksum mismatch, the download may be corrupt")
             
-            # Find the ffmpeg.exe in the extracted directory
-            ffmpeg_dir = next(Path(temp_dir).glob("ffmpeg-master-*"))
-            ffmpeg_bin_dir = ffmpeg_dir / "bin"
+            archive.seek(0)
             
-            # Copy ffmpeg.exe to our bin directory
-            shutil.copy(ffmpeg_bin_dir / "ffmpeg.exe", FFMPEG_PATH)
-            
-            print(f"ffmpeg downloaded and installed to {FFMPEG_PATH}")
-            return FFMPEG_PATH
+            # Extract only ffmpeg.exe instead of the whole archive
+            with zipfile.ZipFile(archive, 'r') as zip_ref:
+                ffmpeg_entry = next(name for name in zip_ref.namelist() if name.endswith("/bin/ffmpeg.exe"))
+                try:
+                    with zip_ref.open(ffmpeg_entry) as src, open(FFMPEG_PATH + ".part", 'wb', buffering=COPY_BUFFER_SIZE) as dst:
+                        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                    os.replace(FFMPEG_PATH + ".part", FFMPEG_PATH)
+                finally:
+                    if os.path.exists(FFMPEG_PATH + ".part"):
+                        os.remove(FFMPEG_PATH + ".part")
+        
+        print(f"ffmpeg downloaded and installed to {FFMPEG_PATH}")
+        return remember_tool("ffmpeg", FFMPEG_PATH)
     except Exception as e:
         print(f"Error downloading ffmpeg: {e}")
         print("Please install ffmpeg manually and add it to your PATH.")
         sys.exit(1)
 
+def ensure_tools():
+    """
+    Make sure yt-dlp and ffmpeg are available, downloading both at the same time if needed.
+    
+    When the yt_dlp package is installed, single downloads run in-process, so
+    the executable is left to be fetched once a batch first needs it.
+    
+    Returns:
+        tuple: (yt-dlp path or None, ffmpeg path)
+    """
+    if YoutubeDL is not None:
+        return None, get_ffmpeg_path()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ytdlp_future = executor.submit(download_ytdlp)
+        ffmpeg_future = executor.submit(get_ffmpeg_path)
+        return ytdlp_future.result(), ffmpeg_future.result()
+
+def build_run_context(ytdlp_path=None, ffmpeg_path=None):
+    """
+    Build the RunContext shared by every download in a run.
+    
+    Args:
+        ytdlp_path (str): Path to yt-dlp, looked up if not given and the
+            yt_dlp package is not installed
+        ffmpeg_path (str): Path to ffmpeg, looked up if not given
+    
+    Returns:
+        RunContext: The tool paths and the URL-independent yt-dlp arguments
+    """
+    if ytdlp_path is None and YoutubeDL is None:
+        ytdlp_path = download_ytdlp()
+    ffmpeg_dir = os.path.dirname(ffmpeg_path or get_ffmpeg_path())
+    base_args = (
+        "--no-warnings",
+        "--ffmpeg-location", ffmpeg_dir,
+        "--merge-output-format", "mp4",
+        "--no-playlist"
+    )
+    return RunContext(ytdlp_path, ffmpeg_dir, base_args)
+
 def is_valid_instagram_url(url):
     """Check if the URL is a valid Instagram URL."""
-    instagram_patterns = [
-        r'https?://(www\.)?instagram\.com/p/[a-zA-Z0-9_-]+/?',
-        r'https?://(www\.)?instagram\.com/reel/[a-zA-Z0-9_-]+/?',
-        r'https?://(www\.)?instagram\.com/stories/[a-zA-Z0-9_.]+/[0-9]+/?',
-        r'https?://(www\.)?instagram\.com/tv/[a-zA-Z0-9_-]+/?',
-        r'https?://(www\.)?instagr\.am/p/[a-zA-Z0-9_-]+/?',
-        r'https?://(www\.)?instagr\.am/reel/[a-zA-Z0-9_-]+/?'
+    return INSTAGRAM_URL_PATTERN.match(url) is not None
+
+def build_ytdlp_command(quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, context=None):
+    """
+    Build the yt-dlp command shared by single and batch downloads, without any URLs.
+    
+    Args:
+        quality (str): Video quality (best, medium, worst)
+        download_dir (str): Directory to save the videos
+        context (RunContext): Run settings, built on demand if not given
+    
+    Returns:
+        list: The yt-dlp command line
+    """
+    context = context or build_run_context()
+    format_string = QUALITY_FORMAT_MAP.get(quality, QUALITY_FORMAT_MAP["best"])
+    
+    # download_ytdlp is cached, so this only downloads on the first use
+    ytdlp_path = context.ytdlp_path or download_ytdlp()
+    return [ytdlp_path, *context.base_args, "-f", format_string, "-o", os.path.join(download_dir, OUTPUT_TEMPLATE)]
+
+def build_ytdlp_options(quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, context=None):
+    """
+    Build the in-process yt-dlp options matching build_ytdlp_command.
+    
+    Args:
+        quality (str): Video quality (best, medium, worst)
+        download_dir (str): Directory to save the videos
+        context (RunContext): Run settings, built on demand if not given
+    
+    Returns:
+        dict: Options for yt_dlp.YoutubeDL
+    """
+    context = context or build_run_context()
+    return {
+        "no_warnings": True,
+        "ffmpeg_location": context.ffmpeg_dir,
+        "format": QUALITY_FORMAT_MAP.get(quality, QUALITY_FORMAT_MAP["best"]),
+        "merge_output_format": "mp4",
+        "outtmpl": os.path.join(download_dir, OUTPUT_TEMPLATE),
+        "noplaylist": True
+    }
+
+def get_youtube_dl(quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, context=None):
+    """
+    Get a YoutubeDL instance for the given settings, reusing it across downloads.
+    
+    Keeping the instance alive avoids re-initializing the extractors and the
+    cookie jar for every URL entered in the same session.
+    """
+    key = (quality, download_dir)
+    if key not in YOUTUBE_DL_INSTANCES:
+        YOUTUBE_DL_INSTANCES[key] = YoutubeDL(build_ytdlp_options(quality, download_dir, context))
+    return YOUTUBE_DL_INSTANCES[key]
+
+def close_youtube_dl_instances():
+    """Close every YoutubeDL instance created by get_youtube_dl."""
+    for ydl in YOUTUBE_DL_INSTANCES.values():
+        ydl.close()
+    YOUTUBE_DL_INSTANCES.clear()
+
+def download_in_process(url, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, context=None):
+    """
+    Download a video with the yt_dlp package, without starting a subprocess.
+    
+    Returns:
+        tuple: (True if the download was successful, metadata dict or None)
+    """
+    try:
+        # The extracted info doubles as the post metadata, so no info-json
+        # file has to be written and read back
+        return True, get_youtube_dl(quality, download_dir, context).extract_info(url, download=True)
+    except DownloadError as e:
+        print(f"Error downloading video: {e}")
+        return False, None
+
+def download_with_executable(url, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, context=None):
+    """
+    Download a video by running the yt-dlp executable.
+    
+    Returns:
+        tuple: (True if the download was successful, metadata dict or None)
+    """
+    cmd = build_ytdlp_command(quality, download_dir, context) + [
+        "--print", METADATA_PRINT_TEMPLATE,  # Report the post metadata on stdout
+        "--progress",  # Keep the progress output that --print would otherwise silence
+        "--newline",
+        url
     ]
     
-    for pattern in instagram_patterns:
-        if re.match(pattern, url):
-            return True
-    return False
+    # Run the command, passing its progress straight through to the console
+    # and keeping only the last lines of output. The output stays as raw
+    # bytes; only the lines that are actually used get decoded.
+    output_tail = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+    metadata_line = None
+    sys.stdout.flush()
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as process:
+        for line in process.stdout:
+            if line.startswith(METADATA_PRINT_PREFIX):
+                metadata_line = line[len(METADATA_PRINT_PREFIX):]
+                continue
+            sys.stdout.buffer.write(line)
+            sys.stdout.buffer.flush()
+            if line.strip():
+                output_tail.append(line.strip())
+        returncode = process.wait()
+    
+    if returncode != 0:
+        error_output = b"\n".join(output_tail).decode(OUTPUT_ENCODING, errors="replace")
+        print(f"Error downloading video: {error_output}")
+        return False, None
+    
+    metadata = None
+    if metadata_line:
+        try:
+            metadata = json.loads(metadata_line.decode(OUTPUT_ENCODING, errors="replace"))
+        except ValueError as e:
+            print(f"Could not extract metadata: {e}")
+    
+    return True, metadata
+
+def print_post_info(metadata):
+    """Display the interesting fields of a post's metadata."""
+    print("\nPost Information:")
+    print(f"Username: {metadata.get('uploader', 'Unknown')}")
+    print(f"Caption: {metadata.get('description', 'No caption')[:100]}...")
+    print(f"Upload Date: {metadata.get('upload_date', 'Unknown')}")
+    print(f"Like Count: {metadata.get('like_count', 'Unknown')}")
+    print(f"Comment Count: {metadata.get('comment_count', 'Unknown')}")
 
-def download_instagram_video(url, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR):
+def download_instagram_video(url, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, context=None):
     """
     Download a video from Instagram.
     
+    Uses the yt_dlp package in-process when it is installed, and the yt-dlp
+    executable otherwise.
+    
     Args:
         url (str): The Instagram URL
         quality (str): Video quality (best, medium, worst)
         download_dir (str): Directory to save the video
+        context (RunContext): Run settings, built on demand if not given
     
     Returns:
         bool: True if download was successful, False otherwise
@@ -130,77 +474,28 @@ def download_instagram_video(url, quality="best", download_dir=DEFAULT_DOWNLOAD_
     # Create download directory if it doesn't exist
     os.makedirs(download_dir, exist_ok=True)
     
-    # Get yt-dlp path
-    ytdlp_path = download_ytdlp()
-    
-    # Get ffmpeg path
-    ffmpeg_path = get_ffmpeg_path()
-    ffmpeg_dir = os.path.dirname(ffmpeg_path)
-    
-    # Map quality options to yt-dlp format strings
-    quality_map = {
-        "best": "bestvideo+bestaudio/best",
-        "medium": "bestvideo[height<=720]+bestaudio/best[height<=720]",
-        "worst": "worstvideo+worstaudio/worst"
-    }
-    
-    format_string = quality_map.get(quality, quality_map["best"])
-    
-    # Output template for the filename
-    output_template = os.path.join(download_dir, "%(uploader)s_%(upload_date)s_%(title).50s.%(ext)s")
-    
-    # Build the yt-dlp command
-    cmd = [
-        ytdlp_path,
-        "--no-warnings",
-        "--ffmpeg-location", ffmpeg_dir,
-        "-f", format_string,
-        "--merge-output-format", "mp4",
-        "-o", output_template,
-        "--write-info-json",
-        "--no-playlist",
-        url
-    ]
-    
     print(f"\nDownloading Instagram video from: {url}")
     print(f"Quality: {quality}")
     print(f"Download directory: {download_dir}")
     print("Please wait...")
     
     try:
-        # Run the command and capture output
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        if YoutubeDL is not None:
+            success, metadata = download_in_process(url, quality, download_dir, context)
+        else:
+            success, metadata = download_with_executable(url, quality, download_dir, context)
         
-        if result.returncode != 0:
-            print(f"Error downloading video: {result.stderr}")
+        if not success:
             return False
         
-        # Extract metadata from the output
-        output = result.stdout
         print("\nDownload completed successfully!")
         
-        # Try to extract and display some metadata
-        try:
-            # Find the JSON file that was created
-            json_files = [f for f in os.listdir(download_dir) if f.endswith('.info.json') and 
-                         os.path.getmtime(os.path.join(download_dir, f)) > time.time() - 10]
-            
-            if json_files:
-                json_path = os.path.join(download_dir, json_files[0])
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                print("\nPost Information:")
-                print(f"Username: {metadata.get('uploader', 'Unknown')}")
-                print(f"Caption: {metadata.get('description', 'No caption')[:100]}...")
-                print(f"Upload Date: {metadata.get('upload_date', 'Unknown')}")
-                print(f"Like Count: {metadata.get('like_count', 'Unknown')}")
-                print(f"Comment Count: {metadata.get('comment_count', 'Unknown')}")
-                
-                # Clean up the JSON file
-                os.remove(json_path)
-        except Exception as e:
-            print(f"Could not extract metadata: {e}")
+        # Try to display some metadata
+        if metadata:
+            try:
+                print_post_info(metadata)
+            except Exception as e:
+                print(f"Could not extract metadata: {e}")
         
         return True
     
@@ -208,19 +503,119 @@ def download_instagram_video(url, quality="best", download_dir=DEFAULT_DOWNLOAD_
         print(f"An unexpected error occurred: {e}")
         return False
 
+async def run_batch_group(cmd, urls):
+    """Run one yt-dlp process over the given URLs, fed through its stdin."""
+    process = await asyncio.create_subprocess_exec(*cmd, stdin=asyncio.subprocess.PIPE)
+    await process.communicate(("\n".join(urls) + "\n").encode())
+    return process.returncode == 0
+
+async def run_batch_groups(cmd, groups):
+    """Run a yt-dlp process per group of URLs at the same time."""
+    return await asyncio.gather(*(run_batch_group(cmd, group) for group in groups))
+
+def run_async(coroutine):
+    """
+    Run a coroutine to completion on a fresh event loop.
+    
+    Stands in for asyncio.run, which needs Python 3.7. On Windows the proactor
+    loop is used explicitly, since older versions default to a loop that
+    cannot start subprocesses.
+    """
+    loop = asyncio.ProactorEventLoop() if sys.platform == "win32" else asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+def download_instagram_batch(urls, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, concurrency=DEFAULT_CONCURRENCY, context=None):
+    """
+    Download several Instagram videos with a few long-lived yt-dlp processes.
+    
+    The URLs are split across up to `concurrency` yt-dlp processes that run
+    at the same time on one event loop, so one process can be fetching
+    streams while another is merging with ffmpeg. Each process gets its share of the URLs through stdin
+    ("-a -"), so yt-dlp startup and extractor initialization are paid once
+    per process rather than once per video.
+    
+    Args:
+        urls (list): The Instagram URLs
+        quality (str): Video quality (best, medium, worst)
+        download_dir (str): Directory to save the videos
+        concurrency (int): Maximum number of simultaneous yt-dlp processes
+        context (RunContext): Run settings, built on demand if not given
+    
+    Returns:
+        bool: True if every download was successful, False otherwise
+    """
+    valid_urls = []
+    for url in urls:
+        if is_valid_instagram_url(url):
+            valid_urls.append(url)
+        else:
+            print(f"Invalid Instagram URL: {url}")
+    
+    if not valid_urls:
+        return False
+    
+    # Create download directory if it doesn't exist
+    os.makedirs(download_dir, exist_ok=True)
+    
+    cmd = build_ytdlp_command(quality, download_dir, context) + ["-a", "-"]
+    
+    print(f"\nDownloading {len(valid_urls)} Instagram videos...")
+    print(f"Quality: {quality}")
+    print(f"Download directory: {download_dir}")
+    print("Please wait...")
+    
+    # Deal the URLs round-robin so every process gets a similar share
+    workers = max(1, min(concurrency, len(valid_urls)))
+    groups = [valid_urls[i::workers] for i in range(workers)]
+    
+    try:
+        results = run_async(run_batch_groups(cmd, groups))
+        return all(results) and len(valid_urls) == len(urls)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return False
+
+def parse_args():
+    """Parse the command-line arguments."""
+    parser = argparse.ArgumentParser(description="Download videos from Instagram.")
+    parser.add_argument("urls", nargs="*", help="Instagram URLs to download without the interactive prompts")
+    parser.add_argument("-q", "--quality", choices=list(QUALITY_FORMAT_MAP), default="best",
+                        help="video quality for URLs given on the command line (default: best)")
+    parser.add_argument("-o", "--output", default=DEFAULT_DOWNLOAD_DIR,
+                        help="download directory for URLs given on the command line")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"maximum number of simultaneous downloads in batch mode (default: {DEFAULT_CONCURRENCY})")
+    return parser.parse_args()
+
 def main():
     """Main function to run the Instagram video downloader."""
+    args = parse_args()
+    
     print("=" * 70)
     print(" " * 20 + "Instagram Video Downloader" + " " * 20)
     print("=" * 70)
     print("Download videos from Instagram with ease.")
     
-    # Check for ffmpeg at startup
-    ffmpeg_path = get_ffmpeg_path()
-    print(f"Using ffmpeg from: {os.path.dirname(ffmpeg_path)}")
+    # Check for yt-dlp and ffmpeg at startup
+    # and work out everything that stays the same for the whole run
+    context = build_run_context(*ensure_tools())
+    print(f"Using ffmpeg from: {context.ffmpeg_dir}")
+    
+    # URLs given on the command line are downloaded as one batch, without prompts
+    if args.urls:
+        if download_instagram_batch(args.urls, args.quality, args.output, args.concurrency, context):
+            print(f"\nVideos saved to: {args.output}")
+        else:
+            print("\nSome videos could not be downloaded.")
+        return
     
     while True:
-        print("\nEnter Instagram URL (or 'q' to quit): ", end="")
+        print("\nEnter Instagram URL ('b' for batch mode, 'q' to quit): ", end="")
         url = input().strip()
         
         if url.lower() == 'q':
@@ -230,6 +625,20 @@ def main():
             print("Please enter a valid URL.")
             continue
         
+        # Batch mode: collect several URLs and download them in one go
+        if url.lower() == 'b':
+            print("Enter Instagram URLs, one per line (empty line to finish):")
+            urls = []
+            while True:
+                line = input().strip()
+                if not line:
+                    break
+                urls.append(line)
+            
+            if not urls:
+                print("No URLs entered.")
+                continue
+        
         # Quality selection
         print("\nSelect video quality:")
         print("1. Best quality (default)")
@@ -238,14 +647,7 @@ def main():
         
         quality_choice = input("Enter your choice (1-3) or press Enter for default: ").strip()
         
-        quality_map = {
-            "1": "best",
-            "2": "medium",
-            "3": "worst",
-            "": "best"  # Default
-        }
-        
-        quality = quality_map.get(quality_choice, "best")
+        quality = QUALITY_CHOICE_MAP.get(quality_choice, "best")
         
         # Custom download directory option
         print("\nUse default download directory? (y/n)")
@@ -263,8 +665,11 @@ def main():
         else:
             download_dir = DEFAULT_DOWNLOAD_DIR
         
-        # Download the video
-        success = download_instagram_video(url, quality, download_dir)
+        # Download the video(s)
+        if url.lower() == 'b':
+            success = download_instagram_batch(urls, quality, download_dir, args.concurrency, context)
+        else:
+            success = download_instagram_video(url, quality, download_dir, context)
         
         if success:
             print(f"\nVideo saved to: {download_dir}")
@@ -280,3 +685,5 @@ if __name__ == "__main__":
         print("\nDownload cancelled by user.")
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
+    finally:
+        close_youtube_dl_instances()
@@ -19,46 +19,174 @@ Features:
 import os
 import re
 import sys
-import json
 import shutil
-import zipfile
-import platform
+import functools
 import subprocess
-import urllib.request
-from pathlib import Path
-from datetime import datetime
+import locale
+import argparse
+import json
 import tempfile
-import time
-import requests
-from urllib.parse import urlparse, parse_qs
+import http.cookiejar
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+# Use yt-dlp in-process when the package is installed, to skip starting an
+# executable for the main download attempt
+try:
+    from yt_dlp import YoutubeDL
+    from yt_dlp.utils import DownloadError
+except ImportError:
+    YoutubeDL = None
 
 # Default download directory
 DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "TikTok_Videos")
 
+# Directory containing this script
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # yt-dlp executable path
-YTDLP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yt-dlp.exe")
+YTDLP_PATH = os.path.join(SCRIPT_DIR, "yt-dlp.exe")
 
 # ffmpeg path
-FFMPEG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin")
+FFMPEG_DIR = os.path.join(SCRIPT_DIR, "bin")
 FFMPEG_PATH = os.path.join(FFMPEG_DIR, "ffmpeg.exe")
 
+# Output filename template
+OUTPUT_TEMPLATE = "tiktok_nowm_%(id)s.%(ext)s"
+
+# Map quality options to yt-dlp format strings
+QUALITY_FORMAT_MAP = {
+    "best": "bestvideo+bestaudio/best",
+    "medium": "bestvideo[height<=720]+bestaudio/best[height<=720]",
+    "worst": "worstvideo+worstaudio/worst"
+}
+
+# Map menu choices to quality options
+QUALITY_CHOICE_MAP = {
+    "1": "best",
+    "2": "medium",
+    "3": "worst",
+    "": "best"  # Default
+}
+
+# Browser identity sent to TikTok, so requests look like they come from its web player
+DESKTOP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+TIKTOK_REFERER = "https://www.tiktok.com/"
+
+# yt-dlp options shared by the desktop download and URL lookup commands
+YTDLP_BASE_ARGS = (
+    "--no-warnings",
+    "--merge-output-format", "mp4",
+    "--no-playlist",
+    "--user-agent", DESKTOP_USER_AGENT,
+    "--add-header", f"Referer:{TIKTOK_REFERER}",
+    "--no-check-certificate"
+)
+
+# Hardware H.264 encoders tried for the watermark crop, fastest first, with their
+# speed settings. libx264 with SOFTWARE_H264_ARGS is used when none of them work.
+HARDWARE_H264_ENCODERS = (
+    ("h264_nvenc", ("-preset", "p1")),
+    ("h264_qsv", ("-preset", "veryfast")),
+    ("h264_videotoolbox", ()),
+)
+SOFTWARE_H264_ARGS = ("-c:v", "libx264", "-preset", "ultrafast", "-crf", "28")
+
+# Encoding yt-dlp and ffmpeg use for their piped error output
+OUTPUT_ENCODING = locale.getpreferredencoding(False)
+
+# Maximum number of simultaneous downloads when several URLs are entered; each
+# one spends part of its time in ffmpeg, so more workers than CPUs would not help
+MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Maximum number of short links resolved at the same time. Resolving only waits
+# on the network, so this is not tied to the CPU count; it stays within the
+# HTTP session's connection pool.
+MAX_RESOLVE_WORKERS = 16
+
+# Number of yt-dlp processes a batch is split across. With two, one process
+# can be downloading while the other is merging with ffmpeg.
+BATCH_PROCESSES = 2
+
+# Buffer size used when streaming downloads to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Largest ffmpeg archive kept in memory before it is spooled to a temporary file
+ARCHIVE_SPOOL_SIZE = 256 * 1024 * 1024
+
+# aria2c arguments for multi-connection downloads, used when aria2c is installed:
+# 8 connections per file in 1 MB segments, up to 4 files at once
+ARIA2C_ARGS = ["-x", "8", "-s", "8", "-k", "1M", "-j", "4"]
+
+
+# TikTok URL pattern, compiled once at import. Standard, short and mobile URLs
+# share one alternation, and the video ID is captured when the URL contains it.
+TIKTOK_URL_PATTERN = re.compile(
+    r'https?://(?:'
+    r'(?:www\.|vm\.)?tiktok\.com/(?:@[^/]+/video/(?P<video_id>\d+)|t/[A-Za-z0-9]+|[A-Za-z0-9]+)'
+    r'|m\.tiktok\.com/v/(?P<mobile_id>\d+))'
+)
+
+# Separators between several URLs entered at the prompt
+MULTI_URL_SEPARATOR = re.compile(r'[\s,]+')
+
+# Video ID in the standard URL a short link redirects to
+TIKTOK_VIDEO_ID_PATTERN = re.compile(r'tiktok\.com/@[^/]+/video/(\d+)')
+
+@functools.lru_cache(maxsize=1)
+def get_http_session():
+    """
+    Get the shared HTTP session, so redirects and tool downloads reuse open connections.
+    
+    requests is imported here rather than at the top of the script, since most
+    runs only need it to follow a short link or fetch the tools once.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    # Some TikTok short links answer the default requests user agent with a
+    # redirect loop instead of the video URL
+    session.headers["User-Agent"] = DESKTOP_USER_AGENT
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    ))
+    return session
+
+def copy_url(url, dst):
+    """Stream the body of url into the writable binary file object dst using the shared HTTP session."""
+    with get_http_session().get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(COPY_BUFFER_SIZE):
+            dst.write(chunk)
+
+def download_file(url, path):
+    """Stream a file from url to path using the shared HTTP session."""
+    with open(path, 'wb') as f:
+        copy_url(url, f)
+
+@functools.lru_cache(maxsize=1)
 def download_ytdlp():
-    """Download the latest yt-dlp executable if not present."""
+    """Download the latest yt-dlp executable if not present (cached after the first call)."""
     if os.path.exists(YTDLP_PATH):
         return YTDLP_PATH
     
     print("yt-dlp not found. Downloading...")
     try:
         url = "https://github.com/yt-dlp/yt-dlp/releases/latest/download/yt-dlp.exe"
-        urllib.request.urlretrieve(url, YTDLP_PATH)
+        download_file(url, YTDLP_PATH)
         print("yt-dlp downloaded successfully.")
         return YTDLP_PATH
     except Exception as e:
         print(f"Error downloading yt-dlp: {e}")
         sys.exit(1)
 
+@functools.lru_cache(maxsize=1)
 def get_ffmpeg_path():
-    """Get the path to ffmpeg, downloading it if necessary."""
+    """Get the path to ffmpeg, downloading it if necessary (cached after the first call)."""
     # Check if ffmpeg is already in the bin directory
     if os.path.exists(FFMPEG_PATH):
         return FFMPEG_PATH
@@ -69,75 +197,262 @@ def get_ffmpeg_path():
         return ffmpeg_in_path
     
     print("ffmpeg not found. Downloading...")
+    import zipfile
+    import tempfile
     try:
         # Create bin directory if it doesn't exist
         os.makedirs(FFMPEG_DIR, exist_ok=True)
         
-        # Download ffmpeg from GitHub
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Download the latest ffmpeg build for Windows
-            ffmpeg_zip = os.path.join(temp_dir, "ffmpeg.zip")
-            ffmpeg_url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
-            urllib.request.urlretrieve(ffmpeg_url, ffmpeg_zip)
+        # Download the latest ffmpeg build for Windows straight into memory
+        # (spilling to a temporary file only past ARCHIVE_SPOOL_SIZE), so the
+        # archive is never written to and re-read from disk
+        ffmpeg_url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
+        with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_SIZE) as archive:
+            copy_url(ffmpeg_url, archive)
+            archive.seek(0)
             
-            # Extract the zip file
-            with zipfile.ZipFile(ffmpeg_zip, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Find the ffmpeg.exe in the extracted directory
-            ffmpeg_dir = next(Path(temp_dir).glob("ffmpeg-master-*"))
-            ffmpeg_bin_dir = ffmpeg_dir / "bin"
-            
-            # Copy ffmpeg.exe to our bin directory
-            shutil.copy(ffmpeg_bin_dir / "ffmpeg.exe", FFMPEG_PATH)
-            
-            print(f"ffmpeg downloaded and installed to {FFMPEG_PATH}")
-            return FFMPEG_PATH
+            # Extract only ffmpeg.exe, straight into our bin directory
+            with zipfile.ZipFile(archive, 'r') as zip_ref:
+                ffmpeg_entry = next(name for name in zip_ref.namelist() if name.endswith("/bin/ffmpeg.exe"))
+                with zip_ref.open(ffmpeg_entry) as src, open(FFMPEG_PATH, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        
+        print(f"ffmpeg downloaded and installed to {FFMPEG_PATH}")
+        return FFMPEG_PATH
     except Exception as e:
         print(f"Error downloading ffmpeg: {e}")
         print("Please install ffmpeg manually and add it to your PATH.")
         sys.exit(1)
 
+@functools.lru_cache(maxsize=1)
+def get_downloader_args():
+    """
+    Get the yt-dlp arguments selecting aria2c as downloader, if it is installed (cached).
+    
+    Returns:
+        tuple: The arguments, or an empty tuple to keep yt-dlp's own downloader
+    """
+    if shutil.which("aria2c") is None:
+        return ()
+    return ("--downloader", "aria2c", "--downloader-args", "aria2c:" + " ".join(ARIA2C_ARGS))
+
+def add_downloader_options(options):
+    """Add the in-process equivalent of get_downloader_args to YoutubeDL options."""
+    if get_downloader_args():
+        options["external_downloader"] = {"default": "aria2c"}
+        options["external_downloader_args"] = {"aria2c": ARIA2C_ARGS}
+    return options
+
+@functools.lru_cache(maxsize=None)
+def get_h264_encoder_args(ffmpeg_path):
+    """
+    Pick the fastest H.264 encoder that works on this machine (cached per ffmpeg).
+    
+    ffmpeg builds list hardware encoders even when the hardware is missing, so
+    each listed one is checked by encoding a single test frame with its speed
+    settings.
+    
+    Returns:
+        tuple: ffmpeg arguments selecting the encoder and its speed settings
+    """
+    try:
+        encoders = subprocess.run([ffmpeg_path, "-hide_banner", "-encoders"],
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout.decode(OUTPUT_ENCODING, errors='replace').split()
+        for encoder, encoder_args in HARDWARE_H264_ENCODERS:
+            if encoder not in encoders:
+                continue
+            # Test with the exact arguments the crop will use, so settings an
+            # older ffmpeg or driver rejects are caught here
+            args = ("-c:v", encoder) + encoder_args
+            test_cmd = [
+                ffmpeg_path, "-hide_banner",
+                "-f", "lavfi", "-i", "color=size=256x256",
+                "-frames:v", "1",
+                *args,
+                "-f", "null", "-"
+            ]
+            if subprocess.run(test_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+                return args
+    except OSError:
+        pass
+    return SOFTWARE_H264_ARGS
+
+def get_direct_video_request(ytdlp_path, url):
+    """
+    Resolve the direct video URL of a TikTok video, with everything needed to request it.
+    
+    TikTok only serves the direct URL to clients that send the cookies yt-dlp
+    received while extracting, so those are read back from a temporary cookie
+    file and returned together with yt-dlp's HTTP headers.
+    
+    Args:
+        ytdlp_path (str): Path to yt-dlp
+        url (str): The TikTok URL
+    
+    Returns:
+        tuple: (direct URL, headers in ffmpeg's -headers format), or (None, error message)
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cookie_file = os.path.join(temp_dir, "cookies.txt")
+        url_cmd = [
+            ytdlp_path,
+            *YTDLP_BASE_ARGS,
+            "-f", "b",
+            "--cookies", cookie_file,  # yt-dlp saves the cookies it received here
+            "--print", "%(url)s",
+            "--print", "%(http_headers)j",
+            url
+        ]
+        
+        url_result = subprocess.run(url_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        lines = url_result.stdout.decode(OUTPUT_ENCODING, errors='replace').splitlines()
+        if url_result.returncode != 0 or len(lines) < 2:
+            return None, url_result.stderr.decode(OUTPUT_ENCODING, errors='replace')
+        
+        direct_url = lines[0].strip()
+        try:
+            headers = json.loads(lines[1])
+            cookie_jar = http.cookiejar.MozillaCookieJar(cookie_file)
+            cookie_jar.load(ignore_discard=True, ignore_expires=True)
+        except (OSError, ValueError) as e:
+            return None, str(e)
+    
+    host = urlparse(direct_url).hostname or ""
+    cookies = "; ".join(f"{cookie.name}={cookie.value}" for cookie in cookie_jar
+                        if host.endswith(cookie.domain.lstrip(".")))
+    if cookies:
+        headers["Cookie"] = cookies
+    return direct_url, "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+
 def is_valid_tiktok_url(url):
     """Check if the URL is a valid TikTok URL."""
-    tiktok_patterns = [
-        r'https?://(www\.|vm\.)?tiktok\.com/(@[^/]+/video/\d+|[A-Za-z0-9]+/?)',
-        r'https?://m\.tiktok\.com/v/\d+',
-        r'https?://(www\.)?tiktok\.com/t/[A-Za-z0-9]+/?'
-    ]
+    return TIKTOK_URL_PATTERN.match(url) is not None
+
+def is_short_url(url):
+    """Check if the URL is a TikTok short link that redirects to the video."""
+    return 'vm.tiktok.com' in url or '/t/' in url
+
+def resolve_short_url(url):
+    """
+    Follow a TikTok short link to the canonical video URL.
     
-    for pattern in tiktok_patterns:
-        if re.match(pattern, url):
-            return True
-    return False
+    Returns:
+        str: The canonical URL, or url itself if it is not a short link or
+             does not redirect to a video
+    """
+    if not is_short_url(url):
+        return url
+    
+    try:
+        response = get_http_session().head(url, allow_redirects=True, timeout=10)
+    except OSError as e:  # requests.RequestException is an OSError
+        print(f"Could not resolve short link: {e}")
+        return url
+    
+    return response.url if TIKTOK_VIDEO_ID_PATTERN.search(response.url) else url
+
+def resolve_short_urls(urls, max_workers=MAX_RESOLVE_WORKERS):
+    """
+    Follow several TikTok short links at the same time.
+    
+    Args:
+        urls (list): TikTok URLs, short or not
+        max_workers (int): Maximum number of simultaneous requests
+    
+    Returns:
+        list: The canonical URL for each URL, in the same order
+    """
+    short_urls = [url for url in urls if is_short_url(url)]
+    if not short_urls:
+        return list(urls)
+    
+    # The shared session keeps a connection pool, so the requests reuse connections
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(short_urls))) as executor:
+        resolved = dict(zip(short_urls, executor.map(resolve_short_url, short_urls)))
+    return [resolved.get(url, url) for url in urls]
 
 def extract_video_id(url):
     """Extract the video ID from a TikTok URL."""
     try:
-        # Try to extract from standard URL format
-        match = re.search(r'tiktok\.com/@[^/]+/video/(\d+)', url)
-        if match:
-            return match.group(1)
+        # Standard and mobile URLs already contain the ID
+        match = TIKTOK_URL_PATTERN.match(url)
+        if match and (match.group('video_id') or match.group('mobile_id')):
+            return match.group('video_id') or match.group('mobile_id')
         
         # Try to extract from shortened URL
-        if 'vm.tiktok.com' in url or '/t/' in url:
+        if is_short_url(url):
             # Follow the redirect to get the actual URL
-            response = requests.head(url, allow_redirects=True)
-            final_url = response.url
-            match = re.search(r'tiktok\.com/@[^/]+/video/(\d+)', final_url)
+            match = TIKTOK_VIDEO_ID_PATTERN.search(resolve_short_url(url))
             if match:
                 return match.group(1)
         
-        # Try to extract from mobile URL
-        match = re.search(r'm\.tiktok\.com/v/(\d+)', url)
-        if match:
-            return match.group(1)
-        
         return None
     except Exception as e:
         print(f"Error extracting video ID: {e}")
         return None
 
+def get_printed_filepath(result):
+    """
+    Get the file path yt-dlp printed for "--print after_move:filepath".
+    
+    Returns:
+        str: Path of the saved video, or None if nothing was printed
+    """
+    lines = result.stdout.decode(OUTPUT_ENCODING, errors='replace').splitlines()
+    return lines[-1].strip() if lines else None
+
+def download_in_process(url, format_string, output_template, ffmpeg_dir):
+    """
+    Run the Method 1 download with the yt_dlp package, without starting a subprocess.
+    
+    Returns:
+        tuple: (True if the download was successful, error message or None,
+                path of the saved file or None)
+    """
+    options = add_downloader_options({
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,
+        "ffmpeg_location": ffmpeg_dir,
+        "format": format_string,
+        "merge_output_format": "mp4",
+        "outtmpl": output_template,
+        "writeinfojson": False,
+        "noplaylist": True,
+        "concurrent_fragment_downloads": 4,
+        "http_chunk_size": 10 * 1024 * 1024,
+        "http_headers": {"User-Agent": DESKTOP_USER_AGENT, "Referer": TIKTOK_REFERER},
+        "nocheckcertificate": True
+    })
+    try:
+        with YoutubeDL(options) as ydl:
+            info = ydl.extract_info(url, download=True)
+    except DownloadError as e:
+        return False, str(e), None
+    
+    # The info dict reports where the file was saved, so no directory scan is needed
+    downloads = info.get("requested_downloads") or [{}]
+    return True, None, downloads[0].get("filepath")
+
+def build_method1_command(ytdlp_path, ffmpeg_dir, format_string, output_template):
+    """
+    Build the Method 1 yt-dlp command shared by single and batch downloads, without any URLs.
+    
+    Returns:
+        list: The yt-dlp command line
+    """
+    return [
+        ytdlp_path,
+        *YTDLP_BASE_ARGS,
+        "--ffmpeg-location", ffmpeg_dir,
+        "-f", format_string,
+        "-o", output_template,
+        "--no-write-info-json",
+        "--concurrent-fragments", "4",  # Fetch fragments in parallel
+        "--http-chunk-size", "10M",
+        *get_downloader_args()
+    ]
+
 def download_tiktok_no_watermark(url, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR):
     """
     Download a video from TikTok without watermark.
@@ -154,6 +469,10 @@ def download_tiktok_no_watermark(url, quality="best", download_dir=DEFAULT_DOWNL
         print("Invalid TikTok URL. Please provide a valid TikTok video URL.")
         return False
     
+    # Resolve short links once, so yt-dlp and the fallbacks all start from the
+    # canonical URL instead of each following the redirect again
+    url = resolve_short_url(url)
+    
     # Create download directory if it doesn't exist
     os.makedirs(download_dir, exist_ok=True)
     
@@ -171,39 +490,26 @@ def download_tiktok_no_watermark(url, quality="best", download_dir=DEFAULT_DOWNL
     print("Please wait...")
     
     # Output template for the filename
-    output_template = os.path.join(download_dir, "tiktok_nowm_%(id)s.%(ext)s")
-    
-    # Map quality options to yt-dlp format strings
-    quality_map = {
-        "best": "bestvideo+bestaudio/best",
-        "medium": "bestvideo[height<=720]+bestaudio/best[height<=720]",
-        "worst": "worstvideo+worstaudio/worst"
-    }
+    output_template = os.path.join(download_dir, OUTPUT_TEMPLATE)
     
-    format_string = quality_map.get(quality, quality_map["best"])
+    format_string = QUALITY_FORMAT_MAP.get(quality, QUALITY_FORMAT_MAP["best"])
     
     # Try Method 1: Direct yt-dlp download with no-watermark option
-    cmd = [
-        ytdlp_path,
-        "--no-warnings",
-        "--ffmpeg-location", ffmpeg_dir,
-        "-f", format_string,
-        "--merge-output-format", "mp4",
-        "-o", output_template,
-        "--no-write-info-json",
-        "--no-playlist",
-        "--user-agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "--add-header", "Referer:https://www.tiktok.com/",
-        "--no-check-certificate",
+    cmd = build_method1_command(ytdlp_path, ffmpeg_dir, format_string, output_template) + [
+        "--print", "after_move:filepath",  # Report where the video was saved
         url
     ]
     
     try:
-        # Run the command and capture output
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        if YoutubeDL is not None:
+            success, error, output_file = download_in_process(url, format_string, output_template, ffmpeg_dir)
+        else:
+            # Run the command, keeping only the printed file path and the error output
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            success, error, output_file = result.returncode == 0, result.stderr.decode(OUTPUT_ENCODING, errors='replace'), get_printed_filepath(result)
         
-        if result.returncode != 0:
-            print(f"Error with Method 1: {result.stderr}")
+        if not success:
+            print(f"Error with Method 1: {error}")
             print("Trying Method 2: Using TikTok API...")
             
             # Method 2: Use TikTok API to get no-watermark URL
@@ -212,24 +518,13 @@ def download_tiktok_no_watermark(url, quality="best", download_dir=DEFAULT_DOWNL
                 print("Could not extract video ID from URL.")
                 return False
             
-            # Use a temporary file for the watermarked version
-            temp_file = os.path.join(download_dir, f"temp_watermarked_{video_id}.mp4")
-            
-            # First download with watermark to get metadata
-            temp_cmd = [
-                ytdlp_path,
-                "--no-warnings",
-                "--ffmpeg-location", ffmpeg_dir,
-                "-o", temp_file,
-                "--no-write-info-json",
-                "--no-playlist",
-                url
-            ]
-            
-            temp_result = subprocess.run(temp_cmd, capture_output=True, text=True)
+            # Only resolve the direct video URL, with the headers and cookies it
+            # needs; ffmpeg reads the video from it while cropping, so nothing
+            # is downloaded twice
+            direct_url, request_headers = get_direct_video_request(ytdlp_path, url)
             
-            if temp_result.returncode != 0:
-                print(f"Error downloading watermarked version: {temp_result.stderr}")
+            if direct_url is None:
+                print(f"Error getting the video URL: {request_headers}")
                 
                 # Try Method 3: Mobile API approach
                 print("Trying Method 3: Mobile API approach...")
@@ -251,16 +546,17 @@ def download_tiktok_no_watermark(url, quality="best", download_dir=DEFAULT_DOWNL
                     "-o", output_template,
                     "--no-write-info-json",
                     "--no-playlist",
+                    "--print", "after_move:filepath",
                     "--user-agent", "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1",
                     "--add-header", "Referer:https://www.tiktok.com/",
                     "--no-check-certificate",
                     mobile_url
                 ]
                 
-                mobile_result = subprocess.run(mobile_cmd, capture_output=True, text=True)
+                mobile_result = subprocess.run(mobile_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
                 
                 if mobile_result.returncode != 0:
-                    print(f"Error with Method 3: {mobile_result.stderr}")
+                    print(f"Error with Method 3: {mobile_result.stderr.decode(OUTPUT_ENCODING, errors='replace')}")
                     
                     # Final attempt: Use a different format selector
                     print("Trying final method with different format selector...")
@@ -273,62 +569,67 @@ def download_tiktok_no_watermark(url, quality="best", download_dir=DEFAULT_DOWNL
                         "--no-write-info-json",
                         "--no-check-certificate",
                         "--no-playlist",
+                        "--print", "after_move:filepath",
                         url
                     ]
                     
-                    final_result = subprocess.run(final_cmd, capture_output=True, text=True)
+                    final_result = subprocess.run(final_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
                     
                     if final_result.returncode != 0:
-                        print(f"All methods failed. Error: {final_result.stderr}")
+                        print(f"All methods failed. Error: {final_result.stderr.decode(OUTPUT_ENCODING, errors='replace')}")
                         return False
+                    
+                    output_file = get_printed_filepath(final_result)
+                else:
+                    output_file = get_printed_filepath(mobile_result)
                 
                 print("\nDownload completed successfully!")
+                print(f"\nVideo saved to: {output_file}")
                 
-                # Find the most recently created mp4 file in the directory
-                try:
-                    mp4_files = [f for f in os.listdir(download_dir) if f.endswith('.mp4') and 
-                                os.path.getmtime(os.path.join(download_dir, f)) > time.time() - 30]
-                    
-                    if mp4_files:
-                        most_recent = max(mp4_files, key=lambda f: os.path.getmtime(os.path.join(download_dir, f)))
-                        output_file = os.path.join(download_dir, most_recent)
-                        print(f"\nVideo saved to: {output_file}")
-                        
-                        # Note about watermark
-                        print("\nNote: This video may still have a watermark as direct removal wasn't possible.")
-                        print("For best results, consider using a video editor to crop out the watermark.")
-                        
-                        return True
-                except Exception as e:
-                    print(f"Could not determine filename: {e}")
-                    return False
+                # Note about watermark
+                print("\nNote: This video may still have a watermark as direct removal wasn't possible.")
+                print("For best results, consider using a video editor to crop out the watermark.")
+                
+                return True
             
-            # If we have the watermarked version, try to crop out the watermark
+            # Crop out the watermark while streaming the video from its direct URL
             output_file = os.path.join(download_dir, f"tiktok_nowm_{video_id}.mp4")
             
             # Use ffmpeg to crop out the watermark (typically at the bottom and right side)
             # This is an approximation and may not work for all videos
             crop_cmd = [
                 ffmpeg_path,
-                "-i", temp_file,
+                "-hwaccel", "auto",
+                "-headers", request_headers,
+                "-i", direct_url,
                 "-vf", "crop=in_w*0.9:in_h*0.9:0:0",  # Crop 10% from right and bottom
+                *get_h264_encoder_args(ffmpeg_path),
                 "-c:a", "copy",
+                "-movflags", "+faststart",
                 "-y",  # Overwrite output file if it exists
                 output_file
             ]
             
             print("Removing watermark...")
-            crop_result = subprocess.run(crop_cmd, capture_output=True, text=True)
-            
-            # Clean up temporary file
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            crop_result = subprocess.run(crop_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             
             if crop_result.returncode != 0:
-                print(f"Error removing watermark: {crop_result.stderr}")
-                print("Using the watermarked version instead.")
-                # Just rename the temp file if cropping failed
-                shutil.move(temp_file, output_file)
+                print(f"Error removing watermark: {crop_result.stderr.decode(OUTPUT_ENCODING, errors='replace')}")
+                print("Downloading the watermarked version instead.")
+                watermarked_cmd = [
+                    ytdlp_path,
+                    *YTDLP_BASE_ARGS,
+                    "--ffmpeg-location", ffmpeg_dir,
+                    "-f", "b",
+                    "-o", output_file,
+                    "--no-write-info-json",
+                    "--force-overwrites",  # Replace any partial output left by ffmpeg
+                    url
+                ]
+                watermarked_result = subprocess.run(watermarked_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                if watermarked_result.returncode != 0:
+                    print(f"Error downloading watermarked version: {watermarked_result.stderr.decode(OUTPUT_ENCODING, errors='replace')}")
+                    return False
             
             print("\nDownload and watermark removal completed!")
             print(f"\nVideo saved to: {output_file}")
@@ -336,16 +637,8 @@ def download_tiktok_no_watermark(url, quality="best", download_dir=DEFAULT_DOWNL
         
         print("\nDownload completed successfully!")
         
-        # Find the most recently created mp4 file in the directory
-        try:
-            mp4_files = [f for f in os.listdir(download_dir) if f.endswith('.mp4') and 
-                        os.path.getmtime(os.path.join(download_dir, f)) > time.time() - 30]
-            
-            if mp4_files:
-                most_recent = max(mp4_files, key=lambda f: os.path.getmtime(os.path.join(download_dir, f)))
-                print(f"\nVideo saved to: {os.path.join(download_dir, most_recent)}")
-        except Exception as e:
-            print(f"Could not determine filename: {e}")
+        if output_file:
+            print(f"\nVideo saved to: {output_file}")
         
         return True
     
@@ -353,8 +646,137 @@ def download_tiktok_no_watermark(url, quality="best", download_dir=DEFAULT_DOWNL
         print(f"An unexpected error occurred: {e}")
         return False
 
+def download_tiktok_videos(urls, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, max_workers=MAX_WORKERS):
+    """
+    Download several TikTok videos concurrently.
+    
+    Args:
+        urls (list): The TikTok URLs
+        quality (str): Video quality (best, medium, worst)
+        download_dir (str): Directory to save the videos
+        max_workers (int): Maximum number of simultaneous downloads
+    
+    Returns:
+        list: One bool per URL, True if that download was successful
+    """
+    # Resolve the tools up front so worker threads never race to download them
+    download_ytdlp()
+    get_ffmpeg_path()
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(lambda url: download_tiktok_no_watermark(url, quality, download_dir), urls))
+
+def run_batch_group(cmd, urls):
+    """
+    Run one yt-dlp process over the given URLs, fed through its stdin.
+    
+    Returns:
+        set: The URLs yt-dlp reported as saved
+    """
+    url_set = set(urls)
+    saved_urls = set()
+    with subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as process:
+        process.stdin.write(("\n".join(urls) + "\n").encode())
+        process.stdin.close()
+        
+        for line in process.stdout:
+            url, _, path = line.decode(OUTPUT_ENCODING, errors='replace').strip().partition(" ")
+            if path and url in url_set:
+                saved_urls.add(url)
+                print(f"Video saved to: {path}")
+    return saved_urls
+
+def download_tiktok_batch(urls, quality="best", download_dir=DEFAULT_DOWNLOAD_DIR, max_workers=MAX_WORKERS,
+                          processes=BATCH_PROCESSES):
+    """
+    Download several TikTok videos with a few long-lived yt-dlp processes.
+    
+    The URLs are split across up to `processes` yt-dlp processes, each fed its
+    share through stdin ("-a -"), so yt-dlp startup and extractor
+    initialization are paid once per process rather than once per video, and
+    one process can be merging with ffmpeg while another downloads.
+    URLs that could not be downloaded this way go through the regular
+    download_tiktok_no_watermark fallback chain, several at a time.
+    
+    Args:
+        urls (list): The TikTok URLs
+        quality (str): Video quality (best, medium, worst)
+        download_dir (str): Directory to save the videos
+        max_workers (int): Maximum number of simultaneous retries
+        processes (int): Maximum number of yt-dlp processes for the batch
+    
+    Returns:
+        list: One bool per URL, True if that download was successful
+    """
+    results = {url: False for url in urls}
+    valid_urls = []
+    for url in results:
+        if is_valid_tiktok_url(url):
+            valid_urls.append(url)
+        else:
+            print(f"Invalid TikTok URL: {url}")
+    
+    if not valid_urls:
+        return [False] * len(urls)
+    
+    os.makedirs(download_dir, exist_ok=True)
+    ytdlp_path = download_ytdlp()
+    ffmpeg_dir = os.path.dirname(get_ffmpeg_path())
+    
+    # Resolve all short links up front and in parallel, instead of leaving
+    # yt-dlp to follow each redirect in turn
+    canonical_urls = dict(zip(valid_urls, resolve_short_urls(valid_urls)))
+    batch_urls = list(dict.fromkeys(canonical_urls.values()))
+    saved_urls = set()
+    
+    format_string = QUALITY_FORMAT_MAP.get(quality, QUALITY_FORMAT_MAP["best"])
+    cmd = build_method1_command(ytdlp_path, ffmpeg_dir, format_string, os.path.join(download_dir, OUTPUT_TEMPLATE)) + [
+        "--print", "after_move:%(original_url)s %(filepath)s",  # Report which URLs were saved, and where
+        "-a", "-"  # Read the URLs from stdin
+    ]
+    
+    print(f"\nDownloading {len(batch_urls)} TikTok videos...")
+    print(f"Quality: {quality}")
+    print(f"Download directory: {download_dir}")
+    print("Please wait...")
+    
+    # Deal the URLs round-robin across the processes, so each gets a similar share
+    workers = max(1, min(processes, len(batch_urls)))
+    groups = [batch_urls[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for group_saved in executor.map(lambda group: run_batch_group(cmd, group), groups):
+            saved_urls |= group_saved
+    
+    for url in valid_urls:
+        results[url] = canonical_urls[url] in saved_urls
+    
+    # Retry anything the batch could not fetch with the full fallback chain
+    failed_urls = [url for url in valid_urls if not results[url]]
+    if failed_urls:
+        print(f"\nRetrying {len(failed_urls)} videos individually...")
+        retry_urls = [canonical_urls[url] for url in failed_urls]
+        for url, success in zip(failed_urls, download_tiktok_videos(retry_urls, quality, download_dir, max_workers)):
+            results[url] = success
+    
+    return [results[url] for url in urls]
+
+def parse_args():
+    """Parse the command-line arguments."""
+    parser = argparse.ArgumentParser(description="Download videos from TikTok without watermarks.")
+    parser.add_argument("urls", nargs="*", help="TikTok URLs to download without the interactive prompts")
+    parser.add_argument("-q", "--quality", choices=list(QUALITY_FORMAT_MAP), default="best",
+                        help="video quality for URLs given on the command line (default: best)")
+    parser.add_argument("-o", "--output", default=DEFAULT_DOWNLOAD_DIR,
+                        help="download directory for URLs given on the command line")
+    parser.add_argument("-c", "--concurrency", type=int,
+                        help=f"maximum number of simultaneous downloads, for the batch and for retrying failed "
+                             f"downloads (default: {BATCH_PROCESSES} for the batch, {MAX_WORKERS} for retries)")
+    return parser.parse_args()
+
 def main():
     """Main function to run the TikTok video downloader."""
+    args = parse_args()
+    
     print("=" * 70)
     print(" " * 15 + "TikTok Video Downloader (No Watermark)" + " " * 15)
     print("=" * 70)
@@ -364,6 +786,17 @@ def main():
     ffmpeg_path = get_ffmpeg_path()
     print(f"Using ffmpeg from: {os.path.dirname(ffmpeg_path)}")
     
+    # URLs given on the command line are downloaded as one batch, without prompts
+    if args.urls:
+        results = download_tiktok_batch(args.urls, args.quality, args.output,
+                                        args.concurrency or MAX_WORKERS, args.concurrency or BATCH_PROCESSES)
+        print(f"\n{sum(results)} of {len(args.urls)} videos downloaded to: {args.output}")
+        return
+    
+    # Settings reused when several URLs are pasted at once
+    quality = "best"
+    download_dir = DEFAULT_DOWNLOAD_DIR
+    
     while True:
         print("\nEnter TikTok URL (or 'q' to quit): ", end="")
         url = input().strip()
@@ -375,6 +808,13 @@ def main():
             print("Please enter a valid URL.")
             continue
         
+        # Several URLs pasted at once are downloaded as one batch with the last used settings
+        urls = [u for u in MULTI_URL_SEPARATOR.split(url) if u]
+        if len(urls) > 1:
+            results = download_tiktok_batch(urls, quality, download_dir)
+            print(f"\n{sum(results)} of {len(urls)} videos downloaded to: {download_dir}")
+            continue
+        
         # Quality selection
         print("\nSelect video quality:")
         print("1. Best quality (default)")
@@ -383,14 +823,7 @@ def main():
         
         quality_choice = input("Enter your choice (1-3) or press Enter for default: ").strip()
         
-        quality_map = {
-            "1": "best",
-            "2": "medium",
-            "3": "worst",
-            "": "best"  # Default
-        }
-        
-        quality = quality_map.get(quality_choice, "best")
+        quality = QUALITY_CHOICE_MAP.get(quality_choice, "best")
         
         # Custom download directory option
         print("\nUse default download directory? (y/n)")
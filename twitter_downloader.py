@@ -10,117 +10,321 @@ import os
 import re
 import sys
 import time
-import urllib.request
-import urllib.error
 import platform
 import subprocess
-import zipfile
+import tempfile
 import shutil
+import functools
+import collections
+import argparse
+import hashlib
+import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-def get_yt_dlp_path():
-    """Get or download the yt-dlp executable."""
-    # Get the directory of the script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
+# Use yt-dlp in-process when the package is installed, so its startup is paid
+# once per session instead of once per download
+try:
+    from yt_dlp import YoutubeDL
+    from yt_dlp.utils import DownloadError
+except ImportError:
+    YoutubeDL = None
+
+# Parse yt-dlp's JSON output with orjson when it is installed; video info can
+# run to hundreds of kilobytes, and orjson reads it several times faster
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Directory containing this script, where yt-dlp and bin/ are kept
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Platform-specific tool locations, worked out once at import
+IS_WINDOWS = platform.system() == 'Windows'
+EXE_SUFFIX = ".exe" if IS_WINDOWS else ""
+BIN_DIR = os.path.join(SCRIPT_DIR, "bin")
+YTDLP_PATH = os.path.join(SCRIPT_DIR, "yt-dlp" + EXE_SUFFIX)
+YTDLP_URL = "https://github.com/yt-dlp/yt-dlp/releases/latest/download/yt-dlp" + EXE_SUFFIX
+FFMPEG_PATH = os.path.join(BIN_DIR, "ffmpeg" + EXE_SUFFIX)
+FFPROBE_PATH = os.path.join(BIN_DIR, "ffprobe" + EXE_SUFFIX)
+
+# Start yt-dlp and ffmpeg without a console window of their own on Windows;
+# their output is read through pipes. CREATE_NO_WINDOW is only named in the
+# subprocess module from Python 3.7.
+SUBPROCESS_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0x08000000) if IS_WINDOWS else 0
+
+# Default download directory
+DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "Twitter_Videos")
+
+# Output filename template, including the tweet author and date
+OUTPUT_TEMPLATE = "%(uploader)s_%(upload_date)s_%(id)s.%(ext)s"
+
+# Twitter/X status URL pattern, compiled once at import. The www and mobile
+# hosts of both domains share one pattern.
+TWITTER_URL_PATTERN = re.compile(r'^https?://(?:(?:www|mobile)\.)?(?:twitter|x)\.com/\w+/status/(?P<status_id>\d+)(?:\?.*)?$')
+
+# Every scheme and host TWITTER_URL_PATTERN accepts, for a quick prefix check
+TWITTER_URL_PREFIXES = tuple(
+    f"{scheme}://{subdomain}{domain}/"
+    for scheme in ("https", "http")
+    for subdomain in ("", "www.", "mobile.")
+    for domain in ("twitter.com", "x.com")
+)
+
+# Directory holding the video info of recently fetched tweets, and how long
+# an entry is reused before the tweet is extracted again (in seconds)
+INFO_CACHE_DIR = os.path.join(SCRIPT_DIR, "cache")
+INFO_CACHE_MAX_AGE = 24 * 60 * 60
+
+# Info is only reused for the download itself while its format URLs are
+# still likely to be valid (in seconds); older info only serves the prompts
+INFO_DOWNLOAD_MAX_AGE = 5 * 60
+
+# Buffer size used when streaming the ffmpeg archive
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Largest ffmpeg archive kept in memory before it is spooled to a temporary file
+ARCHIVE_SPOOL_SIZE = 256 * 1024 * 1024
+
+# aria2c arguments for multi-connection downloads, used when aria2c is installed:
+# 8 connections per file in 1 MB segments, up to 4 files at once
+ARIA2C_ARGS = ["-x", "8", "-s", "8", "-k", "1M", "-j", "4"]
+
+# Suffix of the sidecar file holding the size and mtime of a verified binary
+VERIFIED_SUFFIX = ".verified"
+
+# Seconds a binary gets to print its version. A cold start or a virus scan can
+# make a working binary slower than this, so a timeout never marks it broken.
+VERIFY_TIMEOUT = 15
+
+# Number of yt-dlp output lines kept for finding the file path and errors
+OUTPUT_TAIL_LINES = 50
+
+# Maximum number of simultaneous downloads; each one spends part of its time
+# merging with ffmpeg, so more workers than CPUs would not help
+MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Number of yt-dlp downloads a batch is split across. With two, one can be
+# downloading while the other is merging with ffmpeg.
+BATCH_PROCESSES = 2
+
+# yt-dlp options shared by every Twitter/X download command
+YTDLP_BASE_ARGS = (
+    "--no-playlist",
+    "--no-warnings",
+    "--no-check-certificate",  # Skip HTTPS certificate validation
+    "--write-thumbnail",       # Save thumbnail
+    "--concurrent-fragments", "4"  # Fetch fragments in parallel
+)
+
+# Map quality options to yt-dlp format strings
+QUALITY_FORMAT_MAP = {
+    "best": "best",
+    "medium": "best[height<=720]/best",
+    "worst": "worst"
+}
+
+def get_file_signature(path):
+    """
+    Describe a file by its size and modification time, from a single stat call.
     
-    # Path to yt-dlp executable
-    if platform.system() == 'Windows':
-        yt_dlp_path = os.path.join(script_dir, "yt-dlp.exe")
-    else:
-        yt_dlp_path = os.path.join(script_dir, "yt-dlp")
+    Args:
+        path (str): Path of the file
+        
+    Returns:
+        str: Signature that changes whenever the file is replaced or rewritten
+    """
+    st = os.stat(path)
+    return f"{st.st_size} {st.st_mtime_ns}"
+
+def write_verified_marker(path):
+    """Record the signature of a working binary in a sidecar file next to it."""
+    try:
+        with open(path + VERIFIED_SUFFIX, 'w') as f:
+            f.write(get_file_signature(path))
+    except OSError:
+        pass
+
+def verify_binary(path, version_arg):
+    """
+    Check that an existing binary is complete and runs.
     
-    # Check if yt-dlp already exists
-    if os.path.exists(yt_dlp_path):
-        return yt_dlp_path
+    If the size and mtime recorded after a successful download or probe still
+    match, the binary is trusted without running or reading it. Otherwise it is
+    probed once with its version flag and, on success, the marker is recorded.
+    A probe that times out is inconclusive: the binary is kept, but not marked.
+    
+    Args:
+        path (str): Path of the binary
+        version_arg (str): Flag that makes the binary print its version and exit
+        
+    Returns:
+        bool: True if the binary can be used
+    """
+    try:
+        with open(path + VERIFIED_SUFFIX) as f:
+            if f.read().strip() == get_file_signature(path):
+                return True
+    except OSError:
+        pass
+    
+    try:
+        result = subprocess.run([path, version_arg], stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, timeout=VERIFY_TIMEOUT, creationflags=SUBPROCESS_FLAGS)
+    except subprocess.TimeoutExpired:
+        return True
+    except OSError:
+        return False
+    if result.returncode != 0:
+        return False
+    
+    write_verified_marker(path)
+    return True
+
+def remove_binary(path):
+    """Remove a broken binary and its verified marker."""
+    for stale in (path, path + VERIFIED_SUFFIX):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+
+@functools.lru_cache(maxsize=1)
+def get_http_session():
+    """
+    Get the shared HTTP session, so the tool downloads reuse open connections.
+    
+    requests is imported here rather than at the top of the script, since it
+    is only needed the first time the tools are fetched.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    ))
+    return session
+
+def copy_url(url, dst):
+    """Stream the body of url into the writable binary file object dst using the shared HTTP session."""
+    with get_http_session().get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(COPY_BUFFER_SIZE):
+            dst.write(chunk)
+
+def download_file(url, path):
+    """Stream a file from url to path using the shared HTTP session."""
+    with open(path, 'wb') as f:
+        copy_url(url, f)
+
+@functools.lru_cache(maxsize=1)
+def get_yt_dlp_path():
+    """Get or download the yt-dlp executable (cached after the first call)."""
+    # Check if yt-dlp already exists and is not a leftover from an interrupted download
+    if os.path.exists(YTDLP_PATH):
+        if verify_binary(YTDLP_PATH, '--version'):
+            return YTDLP_PATH
+        print("Existing yt-dlp is broken. Downloading it again...")
+        remove_binary(YTDLP_PATH)
     
     # Download yt-dlp
     print("yt-dlp not found. Downloading...")
+    # Download to a partial file and only move it into place once complete
+    partial_path = YTDLP_PATH + ".part"
     try:
-        if platform.system() == 'Windows':
-            url = "https://github.com/yt-dlp/yt-dlp/releases/latest/download/yt-dlp.exe"
-        else:
-            url = "https://github.com/yt-dlp/yt-dlp/releases/latest/download/yt-dlp"
+        url = YTDLP_URL
         
         print(f"Downloading from {url}...")
-        urllib.request.urlretrieve(url, yt_dlp_path)
+        download_file(url, partial_path)
         
         # Make executable on Unix-like systems
-        if platform.system() != 'Windows':
-            os.chmod(yt_dlp_path, 0o755)
+        if not IS_WINDOWS:
+            os.chmod(partial_path, 0o755)
+        
+        os.replace(partial_path, YTDLP_PATH)
+        write_verified_marker(YTDLP_PATH)
             
-        print(f"yt-dlp downloaded to {yt_dlp_path}")
-        return yt_dlp_path
-    except urllib.error.URLError as e:
+        print(f"yt-dlp downloaded to {YTDLP_PATH}")
+        return YTDLP_PATH
+    except OSError as e:  # requests.RequestException is an OSError
         print(f"Error downloading yt-dlp: {e}")
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
         sys.exit(1)
 
+def add_to_path(directory):
+    """Put a directory at the front of PATH, unless it is already on it."""
+    if directory not in os.environ.get("PATH", "").split(os.pathsep):
+        os.environ["PATH"] = directory + os.pathsep + os.environ.get("PATH", "")
+
+@functools.lru_cache(maxsize=1)
 def get_ffmpeg_path():
-    """Get or download ffmpeg."""
-    # Get the directory of the script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    bin_dir = os.path.join(script_dir, "bin")
-    
+    """Get or download ffmpeg (cached after the first call)."""
     # Create bin directory if it doesn't exist
-    if not os.path.exists(bin_dir):
-        os.makedirs(bin_dir)
-    
-    # Path to ffmpeg executable
-    if platform.system() == 'Windows':
-        ffmpeg_path = os.path.join(bin_dir, "ffmpeg.exe")
-        ffprobe_path = os.path.join(bin_dir, "ffprobe.exe")
-    else:
-        ffmpeg_path = os.path.join(bin_dir, "ffmpeg")
-        ffprobe_path = os.path.join(bin_dir, "ffprobe")
+    if not os.path.exists(BIN_DIR):
+        os.makedirs(BIN_DIR)
     
-    # Check if ffmpeg already exists
-    if os.path.exists(ffmpeg_path) and os.path.exists(ffprobe_path):
-        # Add bin directory to PATH
-        os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
-        return ffmpeg_path
+    # Check if ffmpeg already exists and is not a leftover from an interrupted download
+    if os.path.exists(FFMPEG_PATH) and os.path.exists(FFPROBE_PATH):
+        if verify_binary(FFMPEG_PATH, '-version') and verify_binary(FFPROBE_PATH, '-version'):
+            # Add bin directory to PATH
+            add_to_path(BIN_DIR)
+            return FFMPEG_PATH
+        if IS_WINDOWS:
+            print("Existing ffmpeg is broken. Downloading it again...")
+            remove_binary(FFMPEG_PATH)
+            remove_binary(FFPROBE_PATH)
     
     # Download ffmpeg
-    print("ffmpeg not found. Downloading...")
     try:
-        if platform.system() == 'Windows':
+        if IS_WINDOWS:
+            print("ffmpeg not found. Downloading...")
+            
+            # Only needed for this one-off download, so not imported at startup
+            import zipfile
+            
             # URL for Windows ffmpeg
             url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
-            zip_path = os.path.join(script_dir, "ffmpeg.zip")
             
+            # Download the archive into memory (spilling to a temporary file
+            # only past ARCHIVE_SPOOL_SIZE) instead of saving it next to the script
             print(f"Downloading ffmpeg from {url}...")
-            urllib.request.urlretrieve(url, zip_path)
+            with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_SIZE) as archive:
+                copy_url(url, archive)
+                archive.seek(0)
+                
+                # Extract only ffmpeg and ffprobe, straight into the bin directory
+                print("Extracting ffmpeg...")
+                with zipfile.ZipFile(archive, 'r') as zip_ref:
+                    for name, path in (("ffmpeg.exe", FFMPEG_PATH), ("ffprobe.exe", FFPROBE_PATH)):
+                        entry = next((n for n in zip_ref.namelist() if n.endswith(f"/bin/{name}")), None)
+                        if entry is None:
+                            print(f"Error: Could not find {name} in the ffmpeg archive")
+                            return None
+                        # Extract to a partial file and only move it into place once complete
+                        try:
+                            with zip_ref.open(entry) as src, open(path + ".part", 'wb') as dst:
+                                shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                            os.replace(path + ".part", path)
+                        finally:
+                            if os.path.exists(path + ".part"):
+                                os.remove(path + ".part")
+                        write_verified_marker(path)
             
-            # Extract the zip file
-            print("Extracting ffmpeg...")
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(script_dir)
+            print(f"ffmpeg downloaded to {BIN_DIR}")
             
-            # Move the ffmpeg executables to the bin directory
-            ffmpeg_dir = None
-            for item in os.listdir(script_dir):
-                if item.startswith("ffmpeg-master"):
-                    ffmpeg_dir = os.path.join(script_dir, item)
-                    break
+            # Add bin directory to PATH
+            add_to_path(BIN_DIR)
             
-            if ffmpeg_dir:
-                # Copy ffmpeg and ffprobe to bin directory
-                shutil.copy(os.path.join(ffmpeg_dir, "bin", "ffmpeg.exe"), ffmpeg_path)
-                shutil.copy(os.path.join(ffmpeg_dir, "bin", "ffprobe.exe"), ffprobe_path)
-                
-                # Clean up
-                os.remove(zip_path)
-                shutil.rmtree(ffmpeg_dir)
-                
-                print(f"ffmpeg downloaded to {bin_dir}")
-                
-                # Add bin directory to PATH
-                os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
-                
-                return ffmpeg_path
-            else:
-                print("Error: Could not find ffmpeg directory after extraction")
-                return None
+            return FFMPEG_PATH
         else:
             # For Unix systems, suggest using package manager
+            print("ffmpeg not found or not working.")
             print("Please install ffmpeg using your package manager:")
             print("  Ubuntu/Debian: sudo apt-get install ffmpeg")
             print("  CentOS/RHEL: sudo yum install ffmpeg")
@@ -130,9 +334,61 @@ def get_ffmpeg_path():
         print(f"Error downloading ffmpeg: {e}")
         return None
 
+def find_ffmpeg():
+    """
+    Find an ffmpeg that is already available, without downloading one.
+    
+    Not cached, so an ffmpeg downloaded later in the session is still found;
+    the bin directory check reuses get_ffmpeg_path's cached result.
+    
+    Returns:
+        str: Path to ffmpeg, or None if it is neither in the bin directory nor on PATH
+    """
+    if os.path.exists(FFMPEG_PATH) and os.path.exists(FFPROBE_PATH):
+        return get_ffmpeg_path()
+    return shutil.which("ffmpeg")
+
+def needs_ffmpeg(format_id, video_info=None):
+    """
+    Check whether a download has to merge separate video and audio streams.
+    
+    Args:
+        format_id (str): yt-dlp format string
+        video_info (dict, optional): Video info from get_video_info
+        
+    Returns:
+        bool: True if ffmpeg is required for the download
+    """
+    if "+" in format_id:
+        return True
+    # The preset qualities only ever select single-file formats
+    if format_id in QUALITY_FORMAT_MAP.values():
+        return False
+    return bool(video_info) and ("requested_formats" in video_info or "+" in (video_info.get("format_id") or ""))
+
+@functools.lru_cache(maxsize=1)
+def get_downloader_args():
+    """
+    Get the yt-dlp arguments selecting aria2c as downloader, if it is installed (cached).
+    
+    Returns:
+        tuple: The arguments, or an empty tuple to keep yt-dlp's own downloader
+    """
+    if shutil.which("aria2c") is None:
+        return ()
+    return ("--downloader", "aria2c", "--downloader-args", "aria2c:" + " ".join(ARIA2C_ARGS))
+
+def add_downloader_options(options):
+    """Add the in-process equivalent of get_downloader_args to YoutubeDL options."""
+    if get_downloader_args():
+        options["external_downloader"] = {"default": "aria2c"}
+        options["external_downloader_args"] = {"aria2c": ARIA2C_ARGS}
+    return options
+
+@functools.lru_cache(maxsize=1024)
 def validate_twitter_url(url):
     """
-    Validate if the URL is a Twitter/X URL.
+    Validate if the URL is a Twitter/X URL (cached, as batches often repeat URLs).
     
     Args:
         url (str): The URL to validate
@@ -140,30 +396,51 @@ def validate_twitter_url(url):
     Returns:
         bool: True if valid Twitter/X URL, False otherwise
     """
-    # Regular expression patterns for Twitter/X URLs
-    patterns = [
-        r'^https?://(?:www\.)?twitter\.com/\w+/status/\d+(?:\?.*)?$',
-        r'^https?://(?:www\.)?x\.com/\w+/status/\d+(?:\?.*)?$',
-        r'^https?://(?:mobile\.)?twitter\.com/\w+/status/\d+(?:\?.*)?$',
-        r'^https?://(?:mobile\.)?x\.com/\w+/status/\d+(?:\?.*)?$'
-    ]
-    
-    for pattern in patterns:
-        if re.match(pattern, url):
-            return True
+    # Other sites are turned away by a plain prefix check before the regex runs
+    return url.startswith(TWITTER_URL_PREFIXES) and TWITTER_URL_PATTERN.match(url) is not None
+
+def get_info_cache_path(url):
+    """
+    Get the cache file for a tweet's video info.
     
-    return False
+    Tweets are keyed by status ID, so twitter.com, x.com and mobile links to
+    the same tweet share one entry.
+    """
+    match = TWITTER_URL_PATTERN.match(url)
+    key = match.group('status_id') if match else hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(INFO_CACHE_DIR, key + ".json")
+
+def clear_info_cache():
+    """Remove every cached video info."""
+    shutil.rmtree(INFO_CACHE_DIR, ignore_errors=True)
 
 def get_video_info(url):
-    """Get information about the video using yt-dlp."""
+    """Get information about the video using yt-dlp, reusing a recent cached copy if there is one."""
+    cache_path = get_info_cache_path(url)
+    try:
+        if time.time() - os.path.getmtime(cache_path) < INFO_CACHE_MAX_AGE:
+            with open(cache_path, 'rb') as f:
+                return json_loads(f.read())
+    except (OSError, ValueError):
+        pass  # Not cached, expired or unreadable; extract it again
+    
     try:
         yt_dlp_path = get_yt_dlp_path()
         cmd = [yt_dlp_path, "--dump-json", url]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True, text=True, creationflags=SUBPROCESS_FLAGS)
         
         if result.returncode == 0:
-            import json
-            video_info = json.loads(result.stdout)
+            video_info = json_loads(result.stdout)
+            
+            # Save the raw output for next time, moving it into place only once complete
+            try:
+                os.makedirs(INFO_CACHE_DIR, exist_ok=True)
+                with open(cache_path + ".part", 'w', encoding='utf-8') as f:
+                    f.write(result.stdout)
+                os.replace(cache_path + ".part", cache_path)
+            except OSError:
+                pass  # Not being able to cache only costs an extraction next time
+            
             return video_info
         else:
             print(f"Error getting video info: {result.stderr}")
@@ -172,7 +449,85 @@ def get_video_info(url):
         print(f"Error: {e}")
         return None
 
-def download_twitter_video(url, output_path=None, quality='best'):
+def print_formats(video_info):
+    """
+    Print the formats listed in a video's info, one line per format.
+    
+    Args:
+        video_info (dict): Video info from get_video_info
+    """
+    print("\nAvailable formats:")
+    print(f"{'ID':<24} {'EXT':<5} {'RESOLUTION':<12} {'SIZE':>10}")
+    for fmt in video_info.get('formats') or []:
+        filesize = fmt.get('filesize') or fmt.get('filesize_approx')
+        size = f"{filesize / (1024 * 1024):.2f} MB" if filesize else "unknown"
+        resolution = fmt.get('resolution') or 'unknown'
+        print(f"{fmt.get('format_id', ''):<24} {fmt.get('ext', ''):<5} {resolution:<12} {size:>10}")
+
+def create_youtube_dl(format_id, output_template, ffmpeg_dir=None):
+    """
+    Create a YoutubeDL instance for the given settings.
+    
+    A YoutubeDL object must not run two downloads at once, so each worker
+    creates its own and uses it as a context manager, which closes its
+    sessions and cookie jar once the worker is done.
+    
+    Args:
+        format_id (str): yt-dlp format string
+        output_template (str): yt-dlp output template
+        ffmpeg_dir (str, optional): Directory containing ffmpeg
+        
+    Returns:
+        YoutubeDL: An instance with the same options as the executable command
+    """
+    options = add_downloader_options({
+        "format": format_id,
+        "outtmpl": output_template,
+        "noplaylist": True,
+        "no_warnings": True,
+        "nocheckcertificate": True,
+        "writethumbnail": True,
+        "concurrent_fragment_downloads": 4
+    })
+    if ffmpeg_dir:
+        # Embedding metadata is only possible with ffmpeg
+        options["ffmpeg_location"] = ffmpeg_dir
+        options["postprocessors"] = [{"key": "FFmpegMetadata"}]
+    return YoutubeDL(options)
+
+def download_in_process(ydl, url, video_info=None):
+    """
+    Download a video with the yt_dlp package, without starting a subprocess.
+    
+    Args:
+        ydl (YoutubeDL): Instance from create_youtube_dl
+        url (str): The Twitter/X video URL
+        video_info (dict, optional): Video info from get_video_info, reused
+            instead of extracting the tweet again
+    
+    Returns:
+        tuple: (True if the download was successful, error message or None,
+                path of the saved file or None)
+    """
+    try:
+        info = None
+        if video_info is not None:
+            try:
+                info = ydl.process_ie_result(ydl.sanitize_info(video_info), download=True)
+            except DownloadError:
+                # The format URLs in the info may have expired; extract the tweet
+                # again, as yt-dlp does for --load-info-json
+                print("Download from the fetched info failed. Extracting the video again...")
+        if info is None:
+            info = ydl.extract_info(url, download=True)
+    except DownloadError as e:
+        return False, str(e), None
+    
+    # The info dict reports where the file was saved
+    downloads = info.get("requested_downloads") or [{}]
+    return True, None, downloads[0].get("filepath")
+
+def download_twitter_video(url, output_path=None, quality='best', interactive=True, video_info=None):
     """
     Download a Twitter/X video using yt-dlp.
     
@@ -180,38 +535,35 @@ def download_twitter_video(url, output_path=None, quality='best'):
         url (str): The Twitter/X video URL
         output_path (str, optional): The directory to save the video. Defaults to current directory.
         quality (str, optional): The quality to download. Defaults to 'best'.
+        interactive (bool, optional): Show the video info and offer to pick a specific format. Defaults to True.
+        video_info (dict, optional): Video info already fetched with get_video_info. Fetched here if not given,
+            and reused for the download if recent, so the tweet is only extracted once.
         
     Returns:
         str: Success or error message
     """
     try:
         # Create output directory if it doesn't exist
-        if output_path and not os.path.exists(output_path):
-            os.makedirs(output_path)
+        if output_path:
+            os.makedirs(output_path, exist_ok=True)
         
         # Get yt-dlp path
         yt_dlp_path = get_yt_dlp_path()
         
-        # Get ffmpeg path
-        ffmpeg_path = get_ffmpeg_path()
-        if not ffmpeg_path:
-            print("Warning: ffmpeg not found. Attempting to download...")
-            ffmpeg_path = get_ffmpeg_path()  # Try again after download attempt
-            if not ffmpeg_path:
-                print("Warning: Failed to download ffmpeg. Some videos may not download correctly.")
-        
-        # Get video info first
-        print("Fetching video information...")
-        video_info = get_video_info(url)
+        # Get video info first; it is only needed to offer a format choice
+        if not interactive:
+            video_info = None
+        elif video_info is None:
+            print("Fetching video information...")
+            video_info = get_video_info(url)
         
         if video_info:
             print(f"\nVideo from: @{video_info.get('uploader', 'Unknown')}")
             print(f"Tweet text: {video_info.get('description', 'No description')}")
             
-            # Show available formats
-            print("\nAvailable formats:")
-            cmd = [yt_dlp_path, "-F", url]
-            subprocess.run(cmd)
+            # Show available formats from the info already fetched, instead of
+            # starting yt-dlp again with -F
+            print_formats(video_info)
             
             # Ask user if they want to select a specific format
             use_specific_format = input("\nDo you want to select a specific format? (y/n): ").strip().lower() == 'y'
@@ -220,111 +572,342 @@ def download_twitter_video(url, output_path=None, quality='best'):
                 format_id = input("Enter format ID: ").strip()
             else:
                 # Use the best possible format by default
-                format_id = quality
+                format_id = QUALITY_FORMAT_MAP.get(quality, quality)
         else:
             # If we couldn't get video info, use the best format
-            format_id = quality
+            format_id = QUALITY_FORMAT_MAP.get(quality, quality)
         
         # Prepare the output template
-        # Use a template that includes the tweet author and date
-        output_template = os.path.join(output_path, "%(uploader)s_%(upload_date)s_%(id)s.%(ext)s") if output_path else "%(uploader)s_%(upload_date)s_%(id)s.%(ext)s"
+        output_template = os.path.join(output_path, OUTPUT_TEMPLATE) if output_path else OUTPUT_TEMPLATE
         
-        # Prepare the command
-        cmd = [
-            yt_dlp_path,
-            url,
-            "-f", format_id,
-            "-o", output_template,
-            "--no-playlist",
-            "--no-warnings",
-            "--no-check-certificate",  # Skip HTTPS certificate validation
-            "--add-metadata",          # Add metadata to the file
-            "--write-thumbnail"        # Save thumbnail
-        ]
+        # Most tweets are a single MP4 file, so only download ffmpeg when the
+        # chosen format has to be merged; otherwise use one if it is already there
+        if needs_ffmpeg(format_id, video_info):
+            ffmpeg_path = get_ffmpeg_path()
+            if not ffmpeg_path:
+                print("Warning: ffmpeg not found. This format may not download correctly.")
+        else:
+            ffmpeg_path = find_ffmpeg()
+        
+        ffmpeg_dir = os.path.dirname(ffmpeg_path) if ffmpeg_path else None
         
-        # Add ffmpeg location if we found it
-        if ffmpeg_path:
-            ffmpeg_dir = os.path.dirname(ffmpeg_path)
-            cmd.extend(["--ffmpeg-location", ffmpeg_dir])
+        # Info from the disk cache can be hours old, so the download extracts
+        # the tweet again unless the info was fetched just now (yt-dlp records
+        # the extraction time as "epoch")
+        if video_info and time.time() - video_info.get("epoch", 0) > INFO_DOWNLOAD_MAX_AGE:
+            video_info = None
         
         print(f"\nDownloading video from: {url}")
         print(f"Format: {format_id}")
         print("This may take a moment...")
         
-        # Run the command
-        process = subprocess.run(cmd, 
-                               stdout=subprocess.PIPE, 
-                               stderr=subprocess.PIPE, 
-                               text=True)
+        if YoutubeDL is not None:
+            with create_youtube_dl(format_id, output_template, ffmpeg_dir) as ydl:
+                success, error_msg, filename = download_in_process(ydl, url, video_info)
+        else:
+            # Hand yt-dlp the info already fetched, so it downloads straight
+            # away instead of extracting the tweet a second time
+            info_path = None
+            if video_info:
+                with tempfile.NamedTemporaryFile('w', suffix='.info.json', encoding='utf-8', delete=False) as f:
+                    json.dump(video_info, f)
+                info_path = f.name
+            
+            # Prepare the command
+            cmd = [
+                yt_dlp_path,
+                *(["--load-info-json", info_path] if info_path else [url]),
+                "-f", format_id,
+                "-o", output_template,
+                *YTDLP_BASE_ARGS,
+                "--print", "after_move:filepath",  # Report where the video was saved
+                "--progress",              # Keep the progress output that --print would otherwise silence
+                "--newline",
+                *get_downloader_args()
+            ]
+            
+            # Add ffmpeg location if we found it; metadata can only be embedded with ffmpeg
+            if ffmpeg_dir:
+                cmd.extend(["--ffmpeg-location", ffmpeg_dir, "--add-metadata"])
+            
+            # Run the command, showing its progress as it arrives and keeping
+            # only the last lines of output
+            output_tail = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+            try:
+                with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+                                      creationflags=SUBPROCESS_FLAGS) as process:
+                    for line in process.stdout:
+                        sys.stdout.write(line)
+                        if line.strip():
+                            output_tail.append(line.strip())
+                    success = process.wait() == 0
+            finally:
+                if info_path:
+                    os.remove(info_path)
+            
+            # yt-dlp prints the path of the downloaded file as its last line
+            filename = output_tail[-1] if success and output_tail else None
+            error_msg = "\n".join(line for line in output_tail if line.startswith("ERROR"))
         
         # Check if the download was successful
-        if process.returncode == 0:
-            # Try to find the downloaded file
-            if output_path:
-                # Parse the output to find the filename
-                output_lines = process.stdout.splitlines()
-                filename = None
-                for line in output_lines:
-                    if "Destination:" in line:
-                        filename = line.split("Destination:", 1)[1].strip()
-                        break
-                
-                if filename and os.path.exists(filename):
-                    file_size = os.path.getsize(filename) / (1024 * 1024)  # in MB
+        if success:
+            if filename:
+                try:
+                    file_size = os.stat(filename).st_size / (1024 * 1024)  # in MB
                     return f"Success: Video downloaded successfully!\nSaved to: {filename}\nFile size: {file_size:.2f} MB"
-                
-                # If we couldn't find the filename in the output, look for the most recent file
-                files = os.listdir(output_path)
-                if files:
-                    # Get the most recently modified file
-                    latest_file = max(files, key=lambda f: os.path.getmtime(os.path.join(output_path, f)))
-                    if latest_file.endswith(('.mp4', '.webm')):
-                        file_path = os.path.join(output_path, latest_file)
-                        file_size = os.path.getsize(file_path) / (1024 * 1024)  # in MB
-                        return f"Success: Video downloaded successfully!\nSaved to: {file_path}\nFile size: {file_size:.2f} MB"
+                except OSError:
+                    pass  # The reported file is gone; report success without its size
             
             return "Success: Video downloaded successfully!"
         else:
-            error_msg = process.stderr.strip() if process.stderr else "Unknown error"
-            return f"Error: {error_msg}"
+            return f"Error: {error_msg or 'Unknown error'}"
     
     except Exception as e:
         return f"Error: {str(e)}"
 
+def download_twitter_videos(urls, output_path=None, quality='best', max_workers=MAX_WORKERS):
+    """
+    Download several Twitter/X videos concurrently, without the format prompt.
+    
+    Args:
+        urls (list): The Twitter/X video URLs
+        output_path (str, optional): The directory to save the videos. Defaults to current directory.
+        quality (str, optional): The quality to download. Defaults to 'best'.
+        max_workers (int, optional): Maximum number of simultaneous downloads.
+        
+    Returns:
+        list: One success or error message per URL
+    """
+    # Resolve the tools up front so worker threads never race to download them
+    get_yt_dlp_path()
+    if needs_ffmpeg(QUALITY_FORMAT_MAP.get(quality, quality)):
+        get_ffmpeg_path()
+    else:
+        find_ffmpeg()
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(lambda url: download_twitter_video(url, output_path, quality, interactive=False), urls))
+
+def download_group_in_process(urls, format_id, output_template, ffmpeg_dir=None):
+    """
+    Download the given URLs one after another with a single YoutubeDL instance.
+    
+    Returns:
+        set: The URLs that were saved
+    """
+    saved_urls = set()
+    with create_youtube_dl(format_id, output_template, ffmpeg_dir) as ydl:
+        for url in urls:
+            success, _, filename = download_in_process(ydl, url)
+            if success:
+                saved_urls.add(url)
+            if filename:
+                print(f"Saved to: {filename}")
+    return saved_urls
+
+def run_batch_group(cmd, urls):
+    """
+    Run one yt-dlp process over the given URLs, fed through its stdin.
+    
+    Returns:
+        set: The URLs yt-dlp reported as saved
+    """
+    process = subprocess.run(cmd, input="\n".join(urls) + "\n", stdout=subprocess.PIPE, text=True,
+                             creationflags=SUBPROCESS_FLAGS)
+    
+    url_set = set(urls)
+    saved_urls = set()
+    for line in process.stdout.splitlines():
+        url, _, filename = line.strip().partition(" ")
+        if url in url_set and filename:
+            saved_urls.add(url)
+            print(f"Saved to: {filename}")
+    return saved_urls
+
+def download_twitter_batch(urls, output_path=None, quality='best', max_workers=MAX_WORKERS):
+    """
+    Download several Twitter/X videos with a couple of long-lived yt-dlp workers.
+    
+    The URLs are split across BATCH_PROCESSES in-process YoutubeDL instances
+    or, without the yt_dlp package, yt-dlp processes fed through stdin
+    ("-a -"). yt-dlp startup and extractor initialization are paid once per
+    worker instead of once per video, and one worker can be merging with
+    ffmpeg while another downloads.
+    
+    Args:
+        urls (list): The Twitter/X video URLs
+        output_path (str, optional): The directory to save the videos. Defaults to current directory.
+        quality (str, optional): The quality to download. Defaults to 'best'.
+        max_workers (int, optional): Maximum number of simultaneous retries.
+        
+    Returns:
+        list: One bool per URL, True if that download was successful
+    """
+    results = {url: False for url in urls}
+    valid_urls = []
+    for url in results:
+        if validate_twitter_url(url):
+            valid_urls.append(url)
+        else:
+            print(f"Invalid Twitter/X URL: {url}")
+    
+    if not valid_urls:
+        return [False] * len(urls)
+    
+    # Create output directory if it doesn't exist
+    if output_path:
+        os.makedirs(output_path, exist_ok=True)
+    
+    yt_dlp_path = get_yt_dlp_path()
+    
+    format_id = QUALITY_FORMAT_MAP.get(quality, quality)
+    ffmpeg_path = get_ffmpeg_path() if needs_ffmpeg(format_id) else find_ffmpeg()
+    output_template = os.path.join(output_path, OUTPUT_TEMPLATE) if output_path else OUTPUT_TEMPLATE
+    ffmpeg_dir = os.path.dirname(ffmpeg_path) if ffmpeg_path else None
+    
+    print(f"\nDownloading {len(valid_urls)} videos...")
+    print("This may take a moment...")
+    
+    workers = min(BATCH_PROCESSES, len(valid_urls))
+    # Deal the URLs round-robin across the workers, so each gets a similar share
+    groups = [valid_urls[i::workers] for i in range(workers)]
+    
+    if YoutubeDL is not None:
+        # Each group keeps one warm YoutubeDL instance for all of its downloads
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for saved_urls in executor.map(lambda group: download_group_in_process(group, format_id, output_template, ffmpeg_dir), groups):
+                for url in saved_urls:
+                    results[url] = True
+    else:
+        cmd = [
+            yt_dlp_path,
+            "-f", format_id,
+            "-o", output_template,
+            "--print", "after_move:%(original_url)s %(filepath)s",  # Report which URLs were saved, and where
+            *YTDLP_BASE_ARGS,
+            *get_downloader_args(),
+            "-a", "-"  # Read the URLs from stdin
+        ]
+        
+        if ffmpeg_dir:
+            cmd.extend(["--ffmpeg-location", ffmpeg_dir, "--add-metadata"])
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for saved_urls in executor.map(lambda group: run_batch_group(cmd, group), groups):
+                for url in saved_urls:
+                    results[url] = True
+    
+    # Retry anything the batch could not fetch, several at a time
+    failed_urls = [url for url in valid_urls if not results[url]]
+    if failed_urls:
+        print(f"\nRetrying {len(failed_urls)} videos individually...")
+        for url, message in zip(failed_urls, download_twitter_videos(failed_urls, output_path, quality, max_workers)):
+            print(f"{url}: {message}")
+            results[url] = message.startswith("Success")
+    
+    return [results[url] for url in urls]
+
+def parse_args():
+    """Parse the command-line arguments."""
+    parser = argparse.ArgumentParser(description="Download videos from Twitter/X.")
+    parser.add_argument("urls", nargs="*", help="Twitter/X URLs to download without the interactive prompts")
+    parser.add_argument("-q", "--quality", choices=list(QUALITY_FORMAT_MAP), default="best",
+                        help="video quality for URLs given on the command line (default: best)")
+    parser.add_argument("-o", "--output", default=DEFAULT_DOWNLOAD_DIR,
+                        help="download directory for URLs given on the command line")
+    parser.add_argument("-c", "--concurrency", type=int, default=MAX_WORKERS,
+                        help=f"maximum number of simultaneous retries for failed downloads (default: {MAX_WORKERS})")
+    parser.add_argument("-b", "--batch", metavar="FILE",
+                        help="file with Twitter/X URLs to download without prompts, one per line")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="forget the cached video info of previously fetched tweets")
+    return parser.parse_args()
+
 def main():
     """Main function to run the Twitter/X Video Downloader."""
+    args = parse_args()
+    
+    # Tweet text and titles often contain characters (such as emoji) that a
+    # Windows console cannot show; print a replacement instead of failing
+    if hasattr(sys.stdout, "reconfigure"):  # Python 3.7+
+        sys.stdout.reconfigure(errors="replace")
+    
     print("=" * 70)
     print("Twitter/X Video Downloader".center(70))
     print("=" * 70)
     print("Download videos from Twitter/X with ease.")
     
+    if args.clear_cache:
+        clear_info_cache()
+        print("Cleared the cached video info.")
+    
     # Get the default download directory
-    default_download_dir = os.path.join(os.path.expanduser("~"), "Downloads", "Twitter_Videos")
+    default_download_dir = DEFAULT_DOWNLOAD_DIR
     
     # Create the directory if it doesn't exist
     if not os.path.exists(default_download_dir):
         os.makedirs(default_download_dir)
     
-    # Check for ffmpeg at startup
-    ffmpeg_path = get_ffmpeg_path()
+    # Report ffmpeg at startup; it is only downloaded once a format needs it
+    ffmpeg_path = find_ffmpeg()
     if ffmpeg_path:
         print(f"Using ffmpeg from: {os.path.dirname(ffmpeg_path)}")
     
+    # URLs given on the command line or in a batch file are downloaded as one
+    # batch, without prompts
+    urls = list(args.urls)
+    if args.batch:
+        try:
+            with open(args.batch, 'r', encoding='utf-8') as f:
+                # Skip blank lines and comments, including indented ones
+                lines = (line.strip() for line in f)
+                urls.extend(line for line in lines if line and not line.startswith('#'))
+        except OSError as e:
+            print(f"Error reading batch file: {e}")
+            return
+    
+    if urls:
+        results = download_twitter_batch(urls, args.output, args.quality, args.concurrency)
+        print(f"\n{sum(results)} of {len(urls)} videos downloaded to: {args.output}")
+        return
+    
+    # Fetches video info in the background while the user answers the prompts
+    info_executor = ThreadPoolExecutor(max_workers=1)
+    
     while True:
         # Get the video URL from the user
-        video_url = input("\nEnter Twitter/X URL (or 'q' to quit): ").strip()
+        video_url = input("\nEnter Twitter/X URL ('b' for batch mode, 'q' to quit): ").strip()
         
         if video_url.lower() == 'q':
             print("\nThank you for using Twitter/X Video Downloader!")
             break
         
+        # Batch mode: collect several URLs and download them with one yt-dlp run
+        batch_mode = video_url.lower() == 'b'
+        if batch_mode:
+            print("Enter Twitter/X URLs, one per line (empty line to finish):")
+            video_urls = []
+            while True:
+                line = input().strip()
+                if not line:
+                    break
+                video_urls.append(line)
+            
+            if not video_urls:
+                print("No URLs entered.")
+                continue
+        
         # Validate the URL
-        if not validate_twitter_url(video_url):
+        elif not validate_twitter_url(video_url):
             print("Error: This doesn't appear to be a valid Twitter/X URL.")
             print("Example of valid URL: https://twitter.com/username/status/1234567890")
             print("                      https://x.com/username/status/1234567890")
             continue
         
+        else:
+            # Start fetching the video info now, so it is ready once the prompts are answered
+            info_future = info_executor.submit(get_video_info, video_url)
+        
         # Ask for custom output directory
         use_custom_dir = input(f"Use default download directory ({default_download_dir})? (y/n): ").strip().lower()
         
@@ -348,8 +931,13 @@ def main():
         else:
             quality = 'best'
         
+        if batch_mode:
+            results = download_twitter_batch(video_urls, output_dir, quality)
+            print(f"\n{sum(results)} of {len(video_urls)} videos downloaded to: {output_dir}")
+            continue
+        
         # Download the video
-        result = download_twitter_video(video_url, output_dir, quality)
+        result = download_twitter_video(video_url, output_dir, quality, video_info=info_future.result())
         print(f"\n{result}")
 
 if __name__ == "__main__":
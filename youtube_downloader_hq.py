@@ -15,9 +15,20 @@ import urllib.error
 import platform
 import subprocess
 import zipfile
+import tempfile
 import shutil
+import functools
 from datetime import datetime
 
+# Buffer size used when streaming the ffmpeg archive
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Largest ffmpeg archive kept in memory before it is spooled to a temporary file
+ARCHIVE_SPOOL_SIZE = 256 * 1024 * 1024
+
+# Extensions of the files yt-dlp saves videos as, for finding the latest download
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.mkv')
+
 def get_yt_dlp_path():
     """Get or download the yt-dlp executable."""
     # Get the directory of the script
@@ -54,8 +65,14 @@ def get_yt_dlp_path():
         print(f"Error downloading yt-dlp: {e}")
         sys.exit(1)
 
+def add_to_path(directory):
+    """Put a directory at the front of PATH, unless it is already on it."""
+    if directory not in os.environ.get("PATH", "").split(os.pathsep):
+        os.environ["PATH"] = directory + os.pathsep + os.environ.get("PATH", "")
+
+@functools.lru_cache(maxsize=1)
 def get_ffmpeg_path():
-    """Get or download ffmpeg."""
+    """Get or download ffmpeg (cached after the first call)."""
     # Get the directory of the script
     script_dir = os.path.dirname(os.path.abspath(__file__))
     bin_dir = os.path.join(script_dir, "bin")
@@ -75,7 +92,7 @@ def get_ffmpeg_path():
     # Check if ffmpeg already exists
     if os.path.exists(ffmpeg_path) and os.path.exists(ffprobe_path):
         # Add bin directory to PATH
-        os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+        add_to_path(bin_dir)
         return ffmpeg_path
     
     # Download ffmpeg
@@ -84,41 +101,32 @@ def get_ffmpeg_path():
         if platform.system() == 'Windows':
             # URL for Windows ffmpeg
             url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
-            zip_path = os.path.join(script_dir, "ffmpeg.zip")
             
+            # Download the archive into memory (spilling to a temporary file
+            # only past ARCHIVE_SPOOL_SIZE) instead of saving it next to the script
             print(f"Downloading ffmpeg from {url}...")
-            urllib.request.urlretrieve(url, zip_path)
+            with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_SIZE) as archive:
+                with urllib.request.urlopen(url) as response:
+                    shutil.copyfileobj(response, archive, COPY_BUFFER_SIZE)
+                archive.seek(0)
+                
+                # Extract only ffmpeg and ffprobe, straight into the bin directory
+                print("Extracting ffmpeg...")
+                with zipfile.ZipFile(archive, 'r') as zip_ref:
+                    for name, path in (("ffmpeg.exe", ffmpeg_path), ("ffprobe.exe", ffprobe_path)):
+                        entry = next((n for n in zip_ref.namelist() if n.endswith(f"/bin/{name}")), None)
+                        if entry is None:
+                            print(f"Error: Could not find {name} in the ffmpeg archive")
+                            return None
+                        with zip_ref.open(entry) as src, open(path, 'wb') as dst:
+                            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
             
-            # Extract the zip file
-            print("Extracting ffmpeg...")
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(script_dir)
+            print(f"ffmpeg downloaded to {bin_dir}")
             
-            # Move the ffmpeg executables to the bin directory
-            ffmpeg_dir = None
-            for item in os.listdir(script_dir):
-                if item.startswith("ffmpeg-master"):
-                    ffmpeg_dir = os.path.join(script_dir, item)
-                    break
+            # Add bin directory to PATH
+            add_to_path(bin_dir)
             
-            if ffmpeg_dir:
-                # Copy ffmpeg and ffprobe to bin directory
-                shutil.copy(os.path.join(ffmpeg_dir, "bin", "ffmpeg.exe"), ffmpeg_path)
-                shutil.copy(os.path.join(ffmpeg_dir, "bin", "ffprobe.exe"), ffprobe_path)
-                
-                # Clean up
-                os.remove(zip_path)
-                shutil.rmtree(ffmpeg_dir)
-                
-                print(f"ffmpeg downloaded to {bin_dir}")
-                
-                # Add bin directory to PATH
-                os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
-                
-                return ffmpeg_path
-            else:
-                print("Error: Could not find ffmpeg directory after extraction")
-                return None
+            return ffmpeg_path
         else:
             # For Unix systems, suggest using package manager
             print("Please install ffmpeg using your package manager:")
@@ -242,7 +250,8 @@ def download_youtube_video(url, output_path=None, force_high_quality=True):
             "--no-check-certificate",  # Skip HTTPS certificate validation
             "--prefer-ffmpeg",         # Prefer ffmpeg for post-processing
             "--add-metadata",          # Add metadata to the file
-            "--write-thumbnail"        # Save thumbnail
+            "--write-thumbnail",       # Save thumbnail
+            "--print", "after_move:filepath"  # Report where the video was saved
         ]
         
         print(f"\nDownloading video from: {url}")
@@ -259,16 +268,17 @@ def download_youtube_video(url, output_path=None, force_high_quality=True):
         if process.returncode == 0:
             # Try to find the downloaded file
             if output_path:
-                # Parse the output to find the filename
+                # yt-dlp prints the path of the saved (merged) file as its last line;
+                # the "Destination:" lines only name the separate video and audio parts
                 output_lines = process.stdout.splitlines()
-                filename = None
-                for line in output_lines:
-                    if "Destination:" in line:
-                        filename = line.split("Destination:", 1)[1].strip()
-                        break
+                filename = output_lines[-1].strip() if output_lines else None
+                
+                try:
+                    file_size = os.stat(filename).st_size / (1024 * 1024) if filename else None  # in MB
+                except OSError:
+                    file_size = None
                 
-                if filename and os.path.exists(filename):
-                    file_size = os.path.getsize(filename) / (1024 * 1024)  # in MB
+                if file_size is not None:
                     
                     # Get video dimensions using ffprobe
                     try:
@@ -283,13 +293,12 @@ def download_youtube_video(url, output_path=None, force_high_quality=True):
                     return f"Success: Video downloaded successfully!\nSaved to: {filename}\nFile size: {file_size:.2f} MB{dimensions_info}"
                 
                 # If we couldn't find the filename in the output, look for the most recent file
-                files = os.listdir(output_path)
-                if files:
-                    # Get the most recently modified file
-                    latest_file = max(files, key=lambda f: os.path.getmtime(os.path.join(output_path, f)))
-                    if latest_file.endswith('.mp4'):
-                        file_path = os.path.join(output_path, latest_file)
-                        file_size = os.path.getsize(file_path) / (1024 * 1024)  # in MB
+                with os.scandir(output_path) as entries:
+                    latest_entry = max((e for e in entries if e.name.endswith(VIDEO_EXTENSIONS)), key=lambda e: e.stat().st_mtime, default=None)
+                if latest_entry:
+                    if latest_entry.name.endswith('.mp4'):
+                        file_path = latest_entry.path
+                        file_size = latest_entry.stat().st_size / (1024 * 1024)  # in MB
                         
                         # Get video dimensions using ffprobe
                         try:
@@ -339,10 +339,12 @@ def download_youtube_video(url, output_path=None):
                 downloaded_file = None
                 
                 # Look for recently downloaded mp4 files
-                for file in os.listdir(downloads_dir):
-                    if file.endswith(".mp4") and os.path.getmtime(os.path.join(downloads_dir, file)) > time.time() - 60:
-                        downloaded_file = os.path.join(downloads_dir, file)
-                        break
+                recent_cutoff = time.time() - 60
+                with os.scandir(downloads_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".mp4") and entry.stat().st_mtime > recent_cutoff:
+                            downloaded_file = entry.path
+                            break
                 
                 if downloaded_file:
                     # Move the file to the desired location
@@ -15,6 +15,9 @@ from urllib.error import URLError
 import platform
 from datetime import datetime
 
+# Extensions of the files yt-dlp saves videos as, for finding the latest download
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.mkv')
+
 def get_yt_dlp_path():
     """Get or download the yt-dlp executable."""
     # Get the directory of the script
@@ -117,7 +120,8 @@ def download_youtube_video(url, output_path=None, quality='best'):
             "--no-playlist",
             "--progress",
             "--no-warnings",
-            "--merge-output-format", "mp4"
+            "--merge-output-format", "mp4",
+            "--print", "after_move:filepath"  # Report where the video was saved
         ]
         
         print(f"\nDownloading video from: {url}")
@@ -134,25 +138,24 @@ def download_youtube_video(url, output_path=None, quality='best'):
         if process.returncode == 0:
             # Try to find the downloaded file
             if output_path:
-                # Parse the output to find the filename
+                # yt-dlp prints the path of the saved (merged) file as its last line;
+                # the "Destination:" lines only name the separate video and audio parts
                 output_lines = process.stdout.splitlines()
-                filename = None
-                for line in output_lines:
-                    if "Destination:" in line:
-                        filename = line.split("Destination:", 1)[1].strip()
-                        break
+                filename = output_lines[-1].strip() if output_lines else None
                 
-                if filename and os.path.exists(filename):
-                    file_size = os.path.getsize(filename) / (1024 * 1024)  # in MB
-                    return f"Success: Video downloaded successfully!\nSaved to: {filename}\nFile size: {file_size:.2f} MB"
+                if filename:
+                    try:
+                        file_size = os.stat(filename).st_size / (1024 * 1024)  # in MB
+                        return f"Success: Video downloaded successfully!\nSaved to: {filename}\nFile size: {file_size:.2f} MB"
+                    except OSError:
+                        pass  # Fall back to the most recent file below
                 
                 # If we couldn't find the filename in the output, look for the most recent file
-                files = os.listdir(output_path)
-                if files:
-                    # Get the most recently modified file
-                    latest_file = max(files, key=lambda f: os.path.getmtime(os.path.join(output_path, f)))
-                    file_path = os.path.join(output_path, latest_file)
-                    file_size = os.path.getsize(file_path) / (1024 * 1024)  # in MB
+                with os.scandir(output_path) as entries:
+                    latest_entry = max((e for e in entries if e.name.endswith(VIDEO_EXTENSIONS)), key=lambda e: e.stat().st_mtime, default=None)
+                if latest_entry:
+                    file_path = latest_entry.path
+                    file_size = latest_entry.stat().st_size / (1024 * 1024)  # in MB
                     return f"Success: Video downloaded successfully!\nSaved to: {file_path}\nFile size: {file_size:.2f} MB"
             
             return "Success: Video downloaded successfully!"